@@ -1,12 +1,13 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from structure import UniversalParams,OpenProof
 from jacobian import ProjectivePointG1
 from field import field
 from bls12_381 import fr,fq
 from typing import List
-from arithmetic import MSM,skip_leading_zeros_and_convert_to_bigints,convert_to_bigints,rand_poly,poly_add_poly_mul_const,evaluate,from_coeff_vec,poly_div_poly
+from arithmetic import MSM,skip_leading_zeros_and_convert_to_bigints,convert_to_bigints,rand_poly,poly_add_poly_mul_const,evaluate,divide_by_linear,linear_combination
 from plonk_core.src.proof_system.linearisation_poly import ProofEvaluations
 import random
+import parallel
 
 class Randomness:
     def __init__(self, blind_poly: List[fr.Fr]):
@@ -31,20 +32,32 @@ class Randomness:
     def add_assign(self, f:field, other: 'Randomness'):
         self.blind_poly = poly_add_poly_mul_const(self.blind_poly, f, other.blind_poly)
 
+# MSM of `scalars` against powers[0][offset:], using the fixed-base table of
+# powers_of_g when one is loaded and covers those bases
+def msm_powers_of_g(powers, offset, scalars, params, table=None):
+    if table is not None and table.covers(offset, len(scalars)):
+        return table.msm([s.value for s in scalars], offset)
+    return MSM(powers[0][offset:offset + len(scalars)], scalars, params)
+
 class Commitment:
     def __init__(self,value):
         self.value = value
+    # `randomness` is the blinding polynomial for a hiding commitment; it is
+    # drawn here when not given
     @classmethod
-    def commit(cls,powers,polynomial:list[fr.Fr],hiding_bound,params):
+    def commit(cls,powers,polynomial:list[fr.Fr],hiding_bound,params,table=None,randomness=None):
         num_leading_zeros, plain_coeffs = skip_leading_zeros_and_convert_to_bigints(polynomial)
-        commitment:ProjectivePointG1 = MSM(
-            powers[0][num_leading_zeros:],
+        commitment:ProjectivePointG1 = msm_powers_of_g(
+            powers,
+            num_leading_zeros,
             plain_coeffs,
-            params
+            params,
+            table
         )
-        randomness = Randomness.empty()
-        if hiding_bound:
-            randomness = Randomness.rand(hiding_bound)
+        if randomness is None:
+            randomness = Randomness.empty()
+            if hiding_bound:
+                randomness = Randomness.rand(hiding_bound)
 
         random_ints = convert_to_bigints(randomness.blind_poly)
         random_commitment:ProjectivePointG1 = MSM(powers[1],random_ints,params)
@@ -64,23 +77,22 @@ def open(
     rands,
     _rng=None
 ):
-    combined_polynomial = []
     combined_rand = Randomness.empty()
 
-    opening_challenge_counter = 0
-
-    curr_challenge = opening_challenges(opening_challenge, opening_challenge_counter)
-    opening_challenge_counter += 1
-
+    # Challenge powers 1, c, c^2, ... are built incrementally and the
+    # polynomials combined in one pass (see `linear_combination`)
+    polys = []
+    challenges = []
+    curr_challenge = opening_challenge.one()
     for polynomial, rand in zip(labeled_polynomials, rands):
-
-        combined_polynomial = poly_add_poly_mul_const(combined_polynomial,curr_challenge, polynomial.poly)
+        polys.append(polynomial.poly)
+        challenges.append(curr_challenge)
         combined_rand.add_assign(curr_challenge, rand)
-        curr_challenge = opening_challenges(opening_challenge, opening_challenge_counter)
-        opening_challenge_counter += 1
+        curr_challenge = curr_challenge.mul(opening_challenge)
+    combined_polynomial = linear_combination(polys, challenges)
 
     powers = [ck.powers_of_g,ck.powers_of_gamma_g]
-    proof = open_proof(powers, combined_polynomial, point, combined_rand)
+    proof = open_proof(powers, combined_polynomial, point, combined_rand, ck.powers_of_g_table)
     return proof
 
 dataclass
@@ -104,41 +116,88 @@ class LabeledPoly:
         return cls(label=label, hiding_bound=hiding_bound, poly=poly)
 
 
-def commit_poly(ck:UniversalParams,polys,params):
+# The parts of `powers` (and of the fixed-base `table`) that a commitment to
+# `polynomial` reads, so that parallel jobs do not each carry the whole SRS
+def commit_inputs(powers, table, polynomial, hiding_bound):
+    hiding_size = 0
+    if hiding_bound:
+        hiding_size = Randomness.calculate_hiding_polynomial_degree(hiding_bound) + 1
+    sub_powers = [powers[0][:len(polynomial)], powers[1][:hiding_size]]
+    if table is not None:
+        table = table.prefix(len(polynomial))
+    return sub_powers, table
+
+# Commitments already known while proving, keyed by polynomial identity, so a
+# polynomial that is opened again (or whose commitment comes with the prover
+# key) is not committed twice. Only commitments without hiding are
+# deterministic, so only those are shared.
+class CommitmentRegistry:
+    def __init__(self):
+        self.entries = {}
+
+    # (Commitment, Randomness) of `labeled_poly`, or None when unknown
+    def lookup(self, labeled_poly):
+        if labeled_poly.hiding_bound:
+            return None
+        entry = self.entries.get(id(labeled_poly.poly))
+        # The polynomial is kept in the entry, so its id cannot be reused
+        if entry is None or entry[0] is not labeled_poly.poly:
+            return None
+        return entry[1], entry[2]
+
+    def register(self, poly, commitment, randomness=None):
+        if randomness is None:
+            randomness = Randomness.empty()
+        self.entries[id(poly)] = (poly, commitment, randomness)
+
+# Commit to every labeled polynomial. The commitments are independent, so with
+# several workers (see `parallel`) they are computed in worker processes;
+# the results come back in the order of `polys`. With a `registry`, known
+# commitments are reused and new unhidden ones are recorded. The blinding
+# polynomials of hiding commitments are drawn here, in order, before any job
+# is dispatched, so they do not depend on the number of workers.
+def commit_poly(ck:UniversalParams,polys,params,registry:CommitmentRegistry=None):
     random.seed(42)
-    randomness = []
-    labeled_comm = []
-    for labeled_poly in polys:
-        polynomial = labeled_poly.poly
-        hiding_bound = labeled_poly.hiding_bound
-        label = labeled_poly.label
-
-        powers = [ck.powers_of_g,ck.powers_of_gamma_g]
-
-        comm,rand = Commitment.commit(powers,polynomial,hiding_bound,params)
-        labeled_comm.append(LabeledCommitment.new(label,comm))
-        randomness.append(rand)
+    powers = [ck.powers_of_g,ck.powers_of_gamma_g]
+    results = [None] * len(polys)
+    jobs = []
+    pending = []
+    for i, labeled_poly in enumerate(polys):
+        if registry is not None:
+            results[i] = registry.lookup(labeled_poly)
+        if results[i] is None:
+            polynomial = labeled_poly.poly
+            hiding_bound = labeled_poly.hiding_bound
+            sub_powers, table = commit_inputs(powers, ck.powers_of_g_table, polynomial, hiding_bound)
+            randomness = Randomness.empty()
+            if hiding_bound:
+                randomness = Randomness.rand(hiding_bound)
+            jobs.append((sub_powers, polynomial, hiding_bound, params, table, randomness))
+            pending.append(i)
+
+    for i, result in zip(pending, parallel.map_ordered(Commitment.commit, jobs)):
+        results[i] = result
+        if registry is not None and not polys[i].hiding_bound:
+            registry.register(polys[i].poly, *result)
+
+    labeled_comm = [LabeledCommitment.new(labeled_poly.label,comm)
+                    for labeled_poly, (comm, _) in zip(polys, results)]
+    randomness = [rand for _, rand in results]
     return labeled_comm,randomness
 
-def opening_challenges(opening_challenge: fr.Fr, pow):
-    return opening_challenge.pow(pow)
-
 # Compute witness polynomial.
 #
 # The witness polynomial w(x) the quotient of the division (p(x) - p(z)) / (x - z)
 # Observe that this quotient does not change with z because
 # p(z) is the remainder term. We can therefore omit p(z) when computing the quotient.
 def compute_witness_polynomial(p: List[fr.Fr], point: fr.Fr, randomness: Randomness):
-    neg_p = point.neg()
-    one = point.one()
-    divisor = from_coeff_vec([neg_p,one])
     witness_polynomial = p[:]
     if len(p) != 0:
-        witness_polynomial = poly_div_poly(p, divisor)
+        witness_polynomial = divide_by_linear(p, point)
     random_witness_polynomial = None
     if len(randomness.blind_poly) != 0:
         random_p = randomness.blind_poly
-        random_witness_polynomial = poly_div_poly(random_p, divisor)
+        random_witness_polynomial = divide_by_linear(random_p, point)
     return witness_polynomial, random_witness_polynomial
 
 def open_with_witness_polynomial(
@@ -146,10 +205,11 @@ def open_with_witness_polynomial(
     point: fr.Fr, 
     randomness: Randomness,
     witness_polynomial, 
-    hiding_witness_polynomial):
+    hiding_witness_polynomial,
+    table=None):
 
     num_leading_zeros, witness_coeffs =skip_leading_zeros_and_convert_to_bigints(witness_polynomial)
-    w = MSM(powers[0][num_leading_zeros:],witness_coeffs,point)
+    w = msm_powers_of_g(powers,num_leading_zeros,witness_coeffs,point,table)
     random_v = None
     if hiding_witness_polynomial is not None:
         blinding_p = randomness.blind_poly
@@ -162,7 +222,7 @@ def open_with_witness_polynomial(
     return OpenProof(w.to_affine(), random_v)
 
 # On input a polynomial `p` and a point `point`, outputs a proof for the same.
-def open_proof(powers, p: List[field], point: field, rand: Randomness):
+def open_proof(powers, p: List[field], point: field, rand: Randomness, table=None):
     witness_poly, hiding_witness_poly = compute_witness_polynomial(p, point, rand)
     proof = open_with_witness_polynomial(
             powers,
@@ -170,6 +230,7 @@ def open_proof(powers, p: List[field], point: field, rand: Randomness):
             rand,
             witness_poly,
             hiding_witness_poly,
+            table
         )
     return proof
 @dataclass
@@ -233,3 +294,23 @@ class Proof:
 
     # Subset of all of the evaluations added to the proof.
     evaluations: ProofEvaluations
+
+    # Serialize the commitments, the two opening proofs and the evaluations,
+    # in declaration order
+    def serialize(self, writer):
+        for comm in [self.a_comm, self.b_comm, self.c_comm, self.d_comm, self.z_comm,
+                     self.f_comm, self.h_1_comm, self.h_2_comm, self.z_2_comm,
+                     self.t_1_comm, self.t_2_comm, self.t_3_comm, self.t_4_comm,
+                     self.t_5_comm, self.t_6_comm, self.t_7_comm, self.t_8_comm]:
+            writer = comm.serialize(writer)
+        for opening in [self.aw_opening, self.saw_opening]:
+            writer = opening.w.serialize(writer)
+            if opening.random_v is not None:
+                writer = opening.random_v.serialize(writer)
+        evals = self.evaluations
+        for group in [evals.wire_evals, evals.perm_evals, evals.lookup_evals]:
+            for f in fields(group):
+                writer = getattr(group, f.name).serialize(writer)
+        for _, value in evals.custom_evals.vals:
+            writer = value.serialize(writer)
+        return writer
@@ -1,76 +1,14 @@
 import gmpy2
-import copy
 from bls12_381 import fr,fq
 from domain import Radix2EvaluationDomain
 from structure import AffinePointG1
-from jacobian import ProjectivePointG1
-import math
+from field_vector import FieldVector
+import msm
+import operator
+import itertools
+import parallel
 import random
 
-def reverse_bits(operand, bit_count):
-    acc = 0
-    for i in range(bit_count):
-        acc = (acc << 1) | ((operand >> i) & 1)
-    return acc
-
-def derange(xi, log_len):
-    for idx in range(1, len(xi) - 1):
-        ridx = reverse_bits(idx, log_len)
-        if idx < ridx:
-            xi[idx], xi[ridx] = xi[ridx], xi[idx]
-    return xi
-
-def precompute_twiddles(domain:Radix2EvaluationDomain, root:fr.Fr):
-    log_size = int(math.log2(domain.size))
-    powers = [root.zero()] * (1 << (log_size - 1))
-    powers[0] = root.one()
-    for idx in range(1, len(powers)):
-        powers[idx] = powers[idx - 1].mul(root)
-    return powers
-
-def operator(domain:Radix2EvaluationDomain, xi:list[fr.Fr], root:fr.Fr):
-    log_size = int(math.log2(domain.size))
-    xi = derange(xi,log_size)
-    twiddles=precompute_twiddles(domain,root)
-    chunk = 2
-    twiddle_chunk = domain.size // 2
-    for i in range(log_size):
-        for j in range(0, domain.size, chunk):
-            t = xi[j + chunk // 2]       # Copy Right[0]
-            xi[j + chunk // 2] = xi[j]   # Right[0] = Left[0]
-            xi[j] = xi[j].add(t)
-            xi[j + chunk // 2] = xi[j + chunk // 2].sub(t)
-            for m in range(chunk // 2 - 1):
-                twiddle = twiddles[(m + 1) * twiddle_chunk]
-                t1 = xi[j + chunk // 2 + m + 1]
-                t1 = t1.mul(twiddle)
-                xi[j + chunk // 2 + m + 1] = xi[j + m + 1]
-                xi[j + m + 1] = xi[j + m + 1].add(t1)  # a + b * w
-                # a - b * w
-                xi[j + chunk // 2 + m + 1] = xi[j + chunk // 2 + m + 1].sub(t1)  
-        chunk *= 2  # Merge up
-        twiddle_chunk //= 2
-    return xi
-
-def resize(self, target_len, padding):
-    res = self[:]
-    if len(self) < target_len:
-        num_to_pad = target_len - len(self)
-        res.extend([padding for _ in range(num_to_pad)])
-    return res
-
-def distribute_powers(coeffs:list[fr.Fr], g):
-    g_field = fr.Fr(value = g)
-    one = g_field.one()
-    distribute_powers_and_mul_by_const(coeffs, g_field, one)
-
-# Multiply the `i`-th element of `coeffs` with `c*g^i`.
-def distribute_powers_and_mul_by_const(coeffs, g, c):
-    pow = c
-    for i in range(len(coeffs)):
-        coeffs[i] = coeffs[i].mul(pow)
-        pow = pow.mul(g)
-
 def degree(poly):
     if len(poly)==0:
         return 0
@@ -90,45 +28,69 @@ def skip_leading_zeros_and_convert_to_bigints(p: list[fr.Fr]):
     coeffs = convert_to_bigints(p[num_leading_zeros:])
     return num_leading_zeros, coeffs
 
+# Raw values of `elems` (a FieldVector or a list of field elements), zero padded to `size`
+def to_raw(elems, size):
+    if isinstance(elems, FieldVector):
+        values = elems.values[:]
+    else:
+        values = [e.value for e in elems]
+    if len(values) < size:
+        values.extend([gmpy2.mpz(0)] * (size - len(values)))
+    return values
+
+# Wrap raw values in the same container kind as `like`
+def from_raw(values, like):
+    if isinstance(like, FieldVector):
+        return FieldVector(values, like.field_type)
+    return [fr.Fr(v) for v in values]
+
 def NTT(domain,coeffs):
-    zero = fr.Fr.zero()
-    #add zero to resize
-    resize_coeffs = resize(coeffs,domain.size,zero)
-    evals = operator(domain,resize_coeffs,domain.group_gen)
-    return evals
+    values = to_raw(coeffs, domain.size)
+    domain.ntt_engine().ntt(values)
+    return from_raw(values, coeffs)
 
 def INTT(domain,evals):
-    #add zero to resize
-    zero = fr.Fr.zero()
-    resize_evals = resize(evals,domain.size,zero)
-    evals = operator(domain,resize_evals,domain.group_gen_inv)
-    for i in range(len(evals)):
-        evals[i] = evals[i].mul(domain.size_inv)
-    return evals
+    values = to_raw(evals, domain.size)
+    domain.ntt_engine().intt(values)
+    return from_raw(values, evals)
 
-# Compute a NTT over a coset of the domain, modifying the input vector in place.
+# Compute a NTT over a coset of the domain.
 def coset_NTT(coeffs:list[fr.Fr], domain):
-    modified_coeffs = coeffs[:]
-    distribute_powers(modified_coeffs, fr.Fr.GENERATOR)
-    evals = NTT(domain,modified_coeffs)
-    return evals
-
-# Compute a INTT over a coset of the domain, modifying the input vector in place.
+    values = to_raw(coeffs, domain.size)
+    generator = fr.Fr(value = fr.Fr.GENERATOR)
+    domain.ntt_engine().coset_ntt(values, generator)
+    return from_raw(values, coeffs)
+
+# Compute the coset NTTs of several polynomials over the same domain.
+# The coset-power table and the twiddles are shared by all of them, and the
+# butterflies walk the inputs column-wise, one twiddle at a time.
+def coset_NTT_many(polys, domain):
+    values = [to_raw(p, domain.size) for p in polys]
+    generator = fr.Fr(value = fr.Fr.GENERATOR)
+    domain.ntt_engine().coset_ntt_many(values, generator)
+    return [from_raw(v, p) for v, p in zip(values, polys)]
+
+# Compute a INTT over a coset of the domain.
 def coset_INTT(evals:list[fr.Fr], domain):
-    #add zero to resize
-    zero = fr.Fr.zero()
-    resize_evals = resize(evals,domain.size,zero)
-    evals = operator(domain,resize_evals,domain.group_gen_inv)
-    distribute_powers_and_mul_by_const(evals, domain.generator_inv,domain.size_inv)
-    return evals
+    values = to_raw(evals, domain.size)
+    domain.ntt_engine().coset_intt(values, domain.generator_inv)
+    return from_raw(values, evals)
 
 def from_coeff_vec(coeffs:list):
-    result = coeffs[:]
-    while result and result[-1].value == 0:
-        result.pop()
-    return result
+    end = len(coeffs)
+    while end and coeffs[end - 1].value == 0:
+        end -= 1
+    return coeffs[:end]
 
 def poly_add_poly(self: list[fr.Fr], other: list[fr.Fr]):
+    if isinstance(self, FieldVector) or isinstance(other, FieldVector):
+        if len(self) < len(other):
+            self, other = other, self
+        self = FieldVector.from_list(self)
+        other = FieldVector.from_list(other, self.field_type)
+        result = self[:len(other)].add(other)
+        result.extend(self[len(other):])
+        return from_coeff_vec(result)
     if len(self) == 0:
         res = other[:]
         return res
@@ -153,6 +115,8 @@ def poly_add_poly(self: list[fr.Fr], other: list[fr.Fr]):
 def poly_mul_const(poly:list[fr.Fr],elem:fr.Fr):
     if len(poly) == 0 or elem.value == 0:
         return poly
+    elif isinstance(poly, FieldVector):
+        return poly.scale(elem)
     else:
         result = poly[:]
         for i in range(len(result)):
@@ -190,15 +154,27 @@ def poly_div_poly(self: list[fr.Fr], divisor: list[fr.Fr]):
         res, remainder = divide_with_q_and_r(self,divisor)
         return res
 
+# Quotient of `poly` / (X - point) by synthetic division (Ruffini's rule) in
+# one backward pass over the raw coefficients: q_(i-1) = p_i + point * q_i.
+# The remainder p(point) is dropped. Works on lists and FieldVectors.
+def divide_by_linear(poly, point: fr.Fr):
+    values = FieldVector.from_list(poly, fr.Fr).values
+    m = fr.Fr.MODULUS
+    z = point.mul_operand()
+    quotient = [None] * max(len(values) - 1, 0)
+    acc = 0
+    for i in range(len(values) - 1, 0, -1):
+        acc = (values[i] + acc * z) % m
+        quotient[i - 1] = acc
+    return from_coeff_vec(from_raw(quotient, poly))
+
+# Polynomial of degree `d` with coefficients drawn from `random`; seeding
+# `random` beforehand makes it reproducible
 def rand_poly(d):
-    random.seed(42)
-    random_coeffs = [fr.Fr.from_repr(random.random) for _ in range(d + 1)]
+    m = int(fr.Fr.MODULUS)
+    random_coeffs = [fr.Fr.from_repr(gmpy2.mpz(random.randrange(m))) for _ in range(d + 1)]
     return from_coeff_vec(random_coeffs)
 
-def ln_without_floats(a):
-    # log2(a) * ln(2)
-    return int(math.log2(a) * 69 / 100)
-
 # Evaluates `self` at the given `point` in `Self::Point`.
 def evaluate(self, point: fr.Fr):
     zero = fr.Fr.zero()
@@ -216,6 +192,54 @@ def horner_evaluate(poly_coeffs: list[fr.Fr], point: fr.Fr):
         result = result.add(coeff)
     return result
 
+# Unreduced sums sum(coeffs[k][i] * powers[j][i]) for every polynomial k and
+# point j, over one block of coefficient rows.
+def evaluate_rows(coeffs, powers):
+    return [[sum(map(operator.mul, c, pw)) for pw in powers] for c in coeffs]
+
+# Evaluates every polynomial of `polys` at every point of `points`; returns
+# evals[k][j] = polys[k](points[j]). The powers of each point are tabulated
+# once and shared by all polynomials, and every evaluation is a dot product
+# of raw coefficients with canonical powers (a Montgomery coefficient times a
+# canonical power is already in Montgomery form), reduced once. The rows are
+# split into blocks across workers and the partial sums added up.
+def evaluate_many(polys, points):
+    m = fr.Fr.MODULUS
+    coeffs = [FieldVector.from_list(p, fr.Fr).values for p in polys]
+    size = max([len(c) for c in coeffs] + [1])
+    powers = []
+    for point in points:
+        x = gmpy2.mpz(point.into_repr())
+        table = [gmpy2.mpz(1)]
+        for _ in range(size - 1):
+            table.append(table[-1] * x % m)
+        powers.append(table)
+
+    jobs = [([c[rows] for c in coeffs], [pw[rows] for pw in powers])
+            for rows in parallel.chunk_ranges(size)]
+    blocks = parallel.map_ordered(evaluate_rows, jobs)
+    return [[fr.Fr(sum(block[k][j] for block in blocks) % m) for j in range(len(points))]
+            for k in range(len(polys))]
+
+# Evaluates polynomials of degree below `domain.size`, given by their
+# evaluations over `domain`, at `tau` and at `tau * omega`; returns
+# evals[k] = [p_k(tau), p_k(tau * omega)]. Each value is an inner product with
+# the Lagrange coefficients at `tau` (cached by the domain, so all
+# evaluations share one batch inversion). L_i(tau * omega) = L_{i-1}(tau), so
+# the shifted point reuses the same coefficients against the rotated evaluations.
+def evaluate_lagrange_many(domain, evals, tau):
+    m = fr.Fr.MODULUS
+    lagrange = domain.lagrange_coefficients(tau)
+    zero = fr.Fr.zero().value
+    res = []
+    for e in evals:
+        values = FieldVector.from_list(e, fr.Fr).values
+        values = values + [zero] * (domain.size - len(values))
+        shifted = values[1:] + values[:1]
+        res.append([fr.Fr(sum(map(operator.mul, values, lagrange)) % m),
+                    fr.Fr(sum(map(operator.mul, shifted, lagrange)) % m)])
+    return res
+
 def poly_add_poly_mul_const(self: list[fr.Fr], f: fr.Fr, other: list[fr.Fr]):
     if len(self) == 0:
         self = other[:]
@@ -228,13 +252,24 @@ def poly_add_poly_mul_const(self: list[fr.Fr], f: fr.Fr, other: list[fr.Fr]):
         pass
     else:
         zero = fr.Fr.zero()
-        self = resize(self,len(other),zero)
+        self = self + [zero] * (len(other) - len(self))
     for i in range(len(other)):
         temp = f.mul(other[i])
         self[i] = self[i].add(temp)
     self = from_coeff_vec(self)
     return self
 
+# sum(coeffs[k] * polys[k]) in a single sweep over the coefficient index:
+# every output coefficient is one unreduced dot product of the column of raw
+# coefficients with the canonical multipliers, reduced once and written
+# straight into the result list. Trailing zeros are dropped.
+def linear_combination(polys, coeffs):
+    m = fr.Fr.MODULUS
+    ys = [c.mul_operand() for c in coeffs]
+    columns = itertools.zip_longest(*[FieldVector.from_list(p, fr.Fr).values for p in polys], fillvalue=0)
+    combined = [fr.Fr(sum(map(operator.mul, column, ys)) % m) for column in columns]
+    return from_coeff_vec(combined)
+
 # Given a vector of field elements {v_i}, compute the vector {coeff * v_i^(-1)}
 # This method is explicitly single core.
 def serial_batch_inversion_and_mul(v: list[fr.Fr], coeff: fr.Fr):
@@ -262,9 +297,13 @@ def serial_batch_inversion_and_mul(v: list[fr.Fr], coeff: fr.Fr):
             tmp = new_tmp
             v[len(v) - 1 - i] = f  # Update the value of v with the new result
 
-# Given a vector of field elements {v_i}, compute the vector {coeff * v_i^(-1)}
+# Given a vector of field elements {v_i}, compute the vector {coeff * v_i^(-1)}.
+# A FieldVector is inverted on its raw values.
 def batch_inversion_and_mul(v: list[fr.Fr], coeff: fr.Fr):
-    serial_batch_inversion_and_mul(v, coeff)
+    if isinstance(v, FieldVector):
+        v.batch_inverse_and_mul(coeff)
+    else:
+        serial_batch_inversion_and_mul(v, coeff)
 
 # Given a vector of field elements {v_i}, compute the vector {v_i^(-1)}
 def batch_inversion(v: list[fr.Fr]):
@@ -291,53 +330,8 @@ def compute_first_lagrange_evaluation(
     res = z_h_eval.mul(denom_in)
     return res  
 
+# Multi-scalar multiplication sum(scalars[i] * bases[i]), see `msm.msm`.
+# `scalars` hold their canonical value (e.g. from `convert_to_bigints`).
 def MSM(bases:list[AffinePointG1], scalars:list[fr.Fr], params):
     size = min(len(bases), len(scalars))
-    fq_elem = bases[0].x
-    scalars = scalars[:size]
-    bases = bases[:size]
-    scalars_and_bases_iter = [(s, b) for s, b in zip(scalars, bases) if not s==0]
-
-    c = 3 if size < 32 else ln_without_floats(size) + 2
-    num_bits = fr.Fr.MODULUS_BITS
-    fr_one = params.one()
-    fr_one = fr_one.into_repr()
-
-    zero:ProjectivePointG1 = ProjectivePointG1.zero(fq_elem)
-    window_starts = list(range(0, num_bits, c))
-
-    window_sums = []
-    for w_start in window_starts:
-        res = zero
-        buckets = [zero for _ in range((1 << c) - 1)]
-
-        for org_scalar, org_base in scalars_and_bases_iter:
-            scalar = copy.copy(org_scalar)
-            base = copy.copy(org_base)
-            if scalar.value == fr_one:
-                if w_start == 0:
-                    res = res.add_assign_mixed(base)
-            else:
-                # We right-shift by w_start, thus getting rid of the lower bits
-                scalar.value >>= w_start
-                # We mod the remaining bits by 2^{window size}, thus taking `c` bits.
-                scalar.value %= (1 << c)
-                if scalar.value != 0:
-                    buckets[scalar.value - 1] = buckets[scalar.value - 1].add_assign_mixed(base)
-
-        running_sum:ProjectivePointG1 = ProjectivePointG1.zero(fq_elem)
-        for b in reversed(buckets):
-            running_sum = running_sum.add_assign(b)
-            res = res.add_assign(running_sum)
-
-        window_sums.append(res)
-
-    lowest = window_sums[0]
-
-    total:ProjectivePointG1 = zero
-    for sum_i in reversed(window_sums[1:]):
-        total = total.add_assign(sum_i)
-        for _ in range(c):
-            total = total.double()
-    total = lowest.add_assign(total)
-    return total
+    return msm.msm(bases[:size], [s.value for s in scalars[:size]])
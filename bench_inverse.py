@@ -0,0 +1,31 @@
+import sys
+import time
+import random
+import field
+from bls12_381 import fr,fq
+
+# Time each inversion backend on random elements of Fr and Fq
+# (tests/test_inverse.py checks that they agree):
+#   python3 bench_inverse.py [count]
+def random_elements(cls, count, rng):
+    return [cls.from_repr(rng.randrange(1, int(cls.MODULUS))) for _ in range(count)]
+
+def bench(elements):
+    timings = {}
+    for name in field.INVERSE_BACKENDS:
+        field.set_inverse_backend(name)
+        start = time.perf_counter()
+        for e in elements:
+            type(e).inverse(e)
+        timings[name] = time.perf_counter() - start
+    return timings
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rng = random.Random(0)
+    default = field.INVERSE_BACKEND
+    for cls in (fr.Fr, fq.Fq):
+        elements = random_elements(cls, count, rng)
+        for name, seconds in bench(elements).items():
+            print(f"{cls.__name__} {name:>6}: {seconds / count * 1e6:8.2f} us per inverse")
+    field.set_inverse_backend(default)
@@ -5,13 +5,13 @@ from bls12_381.edwards_fr import Fr
 
 
 
-GENERATOR_X = Fq(gmpy2.mpz(8076246640662884909881801758704306714034609987455869804520522091855516602923))
-GENERATOR_Y = Fq(gmpy2.mpz(13262374693698910701929044844600465831413122818447359594527400194675274060458))
+GENERATOR_X = Fq.from_montgomery(gmpy2.mpz(8076246640662884909881801758704306714034609987455869804520522091855516602923))
+GENERATOR_Y = Fq.from_montgomery(gmpy2.mpz(13262374693698910701929044844600465831413122818447359594527400194675274060458))
 @dataclass
 class EdwardsParameters:
-    COEFF_A = Fq(gmpy2.mpz(41515536288062376014772236515869989659801672835942349428353392091902613913603))
+    COEFF_A = Fq.from_montgomery(gmpy2.mpz(41515536288062376014772236515869989659801672835942349428353392091902613913603))
 
-    COEFF_D = Fq(gmpy2.mpz(39791098284436708367363857153769964807626706786434173600033581261390821521072))
+    COEFF_D = Fq.from_montgomery(gmpy2.mpz(39791098284436708367363857153769964807626706786434173600033581261390821521072))
     
     COFACTOR = [8]
 
@@ -45,6 +45,19 @@ class StandardComposer:
     zero_var: int
 
 
+    # Build the composer from the dictionary returned by `load.read_cs_data`
+    @classmethod
+    def from_data(cls, data):
+        return cls(n=data["n"],q_m=data["q_m"],q_l=data["q_l"],q_r=data["q_r"],
+                   q_o=data["q_o"],q_4=data["q_4"],q_c=data["q_c"],q_hl=data["q_hl"],
+                   q_hr=data["q_hr"],q_h4=data["q_h4"],q_arith=data["q_arith"],
+                   q_range=data["q_range"],q_logic=data["q_logic"],
+                   q_fixed_group_add=data["q_fixed"],public_inputs=data["public_inputs"],
+                   q_variable_group_add=data["q_variable"],
+                   q_lookup=data["q_lookup"],intended_pi_pos=data["intended_pi_pos"],
+                   w_l=data["w_l"],w_r=data["w_r"],w_o=data["w_o"],w_4=data["w_4"],
+                   lookup_table=data["lookup_table"],zero_var=data["zero_var"])
+
     def total_size(self):
         return max(self.n,len(self.lookup_table))
     
@@ -1,7 +1,12 @@
 from dataclasses import dataclass
 import gmpy2
 from bls12_381 import fr
+from ntt import NTTEngine
 import math
+from field_vector import FieldVector
+
+# Number of (domain size, challenge) Lagrange vectors kept by `lagrange_coefficients`
+LAGRANGE_CACHE_SIZE = 4
 
 @dataclass
 class Radix2EvaluationDomain:
@@ -13,6 +18,9 @@ class Radix2EvaluationDomain:
     group_gen_inv: fr.Fr
     generator_inv: fr.Fr
 
+    _elements_cache = {}
+    _lagrange_cache = {}
+
     @classmethod
     def new(cls, num_coeffs: int, params:fr.Fr):
         # Compute the size of our evaluation domain
@@ -51,22 +59,34 @@ class Radix2EvaluationDomain:
     # when i corresponds to the value tau equals, and the coefficient is 0 everywhere else.
     # We handle this case separately, and we can easily detect by checking if the vanishing poly is 0.
     def evaluate_all_lagrange_coefficients(self, tau: fr.Fr):
+        return FieldVector.from_canonical(self.lagrange_coefficients(tau), fr.Fr).to_list()
+
+    # Canonical values of all L_{i,H}(tau), see `evaluate_all_lagrange_coefficients`.
+    # They are cached per domain size and challenge, so every evaluation at tau
+    # shares a single batch inversion. Callers must not modify the list.
+    def lagrange_coefficients(self, tau: fr.Fr):
+        key = (self.size, tau.into_repr())
+        coeffs = Radix2EvaluationDomain._lagrange_cache.get(key)
+        if coeffs is not None:
+            return coeffs
+
+        from msm import batch_inverse
         size = self.size
-        t_size = tau.pow(size)
-        domain_offset = tau.one()
-        one = tau.one()
-        z_h_at_tau = t_size.sub(domain_offset)
-        zero = fr.Fr.zero()
+        m = fr.Fr.MODULUS
+        t = gmpy2.mpz(tau.into_repr())
+        g = gmpy2.mpz(self.group_gen.into_repr())
+        g_inv = gmpy2.mpz(self.group_gen_inv.into_repr())
+        # The domain offset h is one
+        z_h_at_tau = (gmpy2.powmod(t, size, m) - 1) % m
 
-        if z_h_at_tau.value == 0:
-            u = [zero for _ in range(size)]
-            omega_i = domain_offset
+        if z_h_at_tau == 0:
+            coeffs = [gmpy2.mpz(0)] * size
+            omega_i = gmpy2.mpz(1)
             for i in range(size):
-                if omega_i.value == tau.value:
-                    u[i] = one
+                if omega_i == t:
+                    coeffs[i] = gmpy2.mpz(1)
                     break
-                omega_i = omega_i.mul(self.group_gen)
-            return u
+                omega_i = omega_i * g % m
         else:
             # In this case we have to compute `Z_H(tau) * v_i / (tau - h g^i)`
             # for i in 0..size
@@ -76,25 +96,21 @@ class Radix2EvaluationDomain:
             # Notice that since Z_H(tau) is i-independent,
             # and v_i = g * v_{i-1}, it follows that
             # l_i = g^-1 * l_{i-1}
-            # TODO: consider caching the computation of l_i to save N multiplications
-            from arithmetic import batch_inversion
-
             # v_0_inv = m * h^(m-1)
-            f_size = fr.Fr.from_repr(size)
-            pow_dof = domain_offset.pow(size-1)
-            v_0_inv = f_size.mul(pow_dof)
-            z_h_at_tau_inv = fr.Fr.inverse(z_h_at_tau)
-            l_i = z_h_at_tau_inv.mul(v_0_inv)
-            negative_cur_elem = domain_offset.neg()
-            lagrange_coefficients_inverse = [zero for _ in range(size)]
+            l_i = size * gmpy2.invert(z_h_at_tau, m) % m
+            cur_elem = gmpy2.mpz(1)
+            lagrange_coefficients_inverse = [None] * size
             for i in range(size):
-                r_i = tau.add(negative_cur_elem)
-                lagrange_coefficients_inverse[i] = l_i.mul(r_i)
-                # Increment l_i and negative_cur_elem
-                l_i = l_i.mul(self.group_gen_inv)
-                negative_cur_elem = negative_cur_elem.mul(self.group_gen)
-            batch_inversion(lagrange_coefficients_inverse)
-            return lagrange_coefficients_inverse
+                lagrange_coefficients_inverse[i] = l_i * (t - cur_elem) % m
+                # Increment l_i and cur_elem
+                l_i = l_i * g_inv % m
+                cur_elem = cur_elem * g % m
+            coeffs = batch_inverse(lagrange_coefficients_inverse, m)
+
+        if len(Radix2EvaluationDomain._lagrange_cache) >= LAGRANGE_CACHE_SIZE:
+            Radix2EvaluationDomain._lagrange_cache.clear()
+        Radix2EvaluationDomain._lagrange_cache[key] = coeffs
+        return coeffs
         
     # def evaluate_all_lagrange_coefficients(self, tau: field):
     #     size = self.size
@@ -131,6 +147,22 @@ class Radix2EvaluationDomain:
 
     #         return u
     
+    # Returns the NTT engine for this domain. Its bit-reversal and twiddle tables
+    # are built once per domain size and shared by every transform.
+    def ntt_engine(self):
+        return NTTEngine.for_domain(self)
+
+    # All elements g^0, g^1, ..., g^(size-1) of the domain. The list is built
+    # once per domain size and shared, so callers must not modify it.
+    def elements(self):
+        elements = Radix2EvaluationDomain._elements_cache.get(self.size)
+        if elements is None:
+            elements = [self.group_gen.one()]
+            for _ in range(1, self.size):
+                elements.append(elements[-1].mul(self.group_gen))
+            Radix2EvaluationDomain._elements_cache[self.size] = elements
+        return elements
+
     # This evaluates the vanishing polynomial for this domain at tau.
     # For multiplicative subgroups, this polynomial is `z(X) = X^self.size - 1`.
     def evaluate_vanishing_polynomial(self, tau: fr.Fr):
@@ -1,12 +1,108 @@
 import gmpy2
 import math
+import os
+import functools
 from dataclasses import dataclass
 from serialize import buffer_byte_size
 from bytes import write
 from transcript import flags
+
+# Field arithmetic backend, chosen once at import time through PLONK_FIELD_BACKEND.
+# "montgomery" (default) keeps every value as a*R mod p, the layout of the data files.
+# "canonical" keeps plain residues, so a product is a single multiply and reduction.
+# Both produce bit-identical proofs; values read from files go through `from_montgomery`.
+BACKEND = os.environ.get("PLONK_FIELD_BACKEND", "montgomery")
+if BACKEND not in ("montgomery", "canonical"):
+    raise ValueError(f"unknown field backend {BACKEND}")
+MONTGOMERY = BACKEND == "montgomery"
+
+# Inverse of `u` modulo the prime `modulus` with a binary extended Euclid
+# loop, the original implementation
+def invert_binary(u, modulus):
+    one = gmpy2.mpz(1)
+    v = modulus
+    b = one
+    c = gmpy2.mpz(0)
+
+    while u != one and v != one:
+        while u & 1 == 0:
+            u = u // 2
+            if b & 1 == 0:
+                b = b // 2
+            else:
+                b = b + modulus
+                b = b // 2
+        while v & 1 == 0:
+            v =v // 2
+            if c & 1 == 0:
+                c = c // 2
+            else:
+                c = c + modulus
+                c = c // 2
+        if v < u:
+            u = u-v
+            if c > b:
+                b = b + modulus
+            b = b - c
+            b = gmpy2.f_mod(b, modulus)
+        else:
+            v = v-u
+            if b > c:
+                c = c + modulus
+            c = c - b
+            c = gmpy2.f_mod(c, modulus)
+    if u == one:
+        return b
+    else:
+        return c
+
+# GMP's extended gcd
+def invert_gmpy2(u, modulus):
+    return gmpy2.invert(u, modulus)
+
+# Fermat's little theorem, u^(p-2), with GMP's side-channel resistant powmod.
+# The exponentiation does not depend on `u`; the surrounding Python code
+# is not constant time, so this only narrows the timing leak.
+def invert_fermat(u, modulus):
+    return gmpy2.powmod_sec(u, modulus - 2, modulus)
+
+# Inversion backend, chosen through PLONK_INVERSE_BACKEND or `set_inverse_backend`.
+# "gmpy2" (default) is the fastest, "fermat" the constant-time option and
+# "binary" the original pure Python loop. All return the same values.
+INVERSE_BACKENDS = {
+    "gmpy2": invert_gmpy2,
+    "fermat": invert_fermat,
+    "binary": invert_binary,
+}
+
+def set_inverse_backend(name):
+    global INVERSE_BACKEND, _invert
+    if name not in INVERSE_BACKENDS:
+        raise ValueError(f"unknown inverse backend {name}")
+    INVERSE_BACKEND = name
+    _invert = INVERSE_BACKENDS[name]
+
+set_inverse_backend(os.environ.get("PLONK_INVERSE_BACKEND", "gmpy2"))
+
+# Factor that brings a power of a raw value back to the field's representation:
+# in Montgomery form (a*R)^e = a^e * R^e, so the result is multiplied by R^(1-e).
+# Exponents repeat (the S-box power, domain sizes), so the factors are cached.
+@functools.lru_cache(maxsize=1024)
+def pow_fixup(cls, exp):
+    if not MONTGOMERY:
+        return gmpy2.mpz(1)
+    return gmpy2.powmod(cls.R_INV, exp - 1, cls.MODULUS)
+
 @dataclass
 class field:
 
+    # The generator and root of unity constants are written in Montgomery form
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not MONTGOMERY:
+            cls.GENERATOR = gmpy2.mpz(cls.GENERATOR) * cls.R_INV % cls.MODULUS
+            cls.TWO_ADIC_ROOT_OF_UNITY = gmpy2.mpz(cls.TWO_ADIC_ROOT_OF_UNITY) * cls.R_INV % cls.MODULUS
+
     @classmethod
     def zero(cls):
         return cls(gmpy2.mpz(0))
@@ -14,13 +110,31 @@ class field:
     # Return the Multiplicative identity
     def one(self):
         cls = type(self)
-        return cls(self.R)
+        if MONTGOMERY:
+            return cls(self.R)
+        return cls(gmpy2.mpz(1))
+
+    # Build the element whose Montgomery representation is `raw`
+    @classmethod
+    def from_montgomery(cls, raw):
+        if MONTGOMERY:
+            return cls(raw)
+        return cls(raw * cls.R_INV % cls.MODULUS)
     
     def add(self,b):
         cls = type(self)
         res = self.value + b.value
         res %= cls.MODULUS
         return cls(res)
+
+    # Add a chain of terms to self with a single reduction at the end
+    def add_many(self, terms):
+        cls = type(self)
+        res = self.value
+        for t in terms:
+            res += t.value
+        res %= cls.MODULUS
+        return cls(res)
     
     def sub(self,b):
         cls = type(self)
@@ -40,33 +154,47 @@ class field:
         res = self.add(self)
         return res
 
-    #mongomery mul
-    def mul(self, b):
-        cls = type(self)
-        res = self.value * b.value
-        #keep the result in mongomery form, same as mongomery reduce
-        res = res * self.R_INV
-        res %= self.MODULUS
-        return cls(res)
+    if MONTGOMERY:
+        #mongomery mul
+        def mul(self, b):
+            cls = type(self)
+            res = self.value * b.value
+            #keep the result in mongomery form, same as mongomery reduce
+            res = res * self.R_INV
+            res %= self.MODULUS
+            return cls(res)
+    else:
+        def mul(self, b):
+            cls = type(self)
+            return cls(self.value * b.value % self.MODULUS)
     
+    # Raw multiplier `y` such that `x * y % MODULUS` is the product of a raw value `x` with self
+    def mul_operand(self):
+        if MONTGOMERY:
+            return self.value * self.R_INV % self.MODULUS
+        return self.value
+
     def square(self):
         self = self.mul(self)
         return self
     
+    # self^exp for any non-negative exponent, through GMP's sliding-window powmod
     def pow(self,exp):
-        res = self.one()
-        for i in range(63,-1,-1):
-            #modsquare
-            res = res.square()
-            if ((exp >> i) & 1) == 1:
-                res = res.mul(self)
-        return res
+        cls = type(self)
+        if exp == 0:
+            return self.one()
+        res = gmpy2.powmod(self.value, exp, cls.MODULUS)
+        if MONTGOMERY:
+            res = res * pow_fixup(cls, exp) % cls.MODULUS
+        return cls(res)
     
     #new
     @classmethod
     def from_repr(cls, r):
         if r == 0:
             return cls(r)
+        elif not MONTGOMERY:
+            return cls(gmpy2.mpz(r) % cls.MODULUS)
         else:  
             r=cls(r)
             R2 = cls(cls.R2)
@@ -75,7 +203,7 @@ class field:
         
     #Montgomery Reduction
     def into_repr(self):
-        if self.value == 0:
+        if self.value == 0 or not MONTGOMERY:
             return self.value
         else:
             res = self.value * self.R_INV
@@ -102,50 +230,21 @@ class field:
     #         x = x.mul(R2)
     #         x = x.mul(R2)
     #         return x
+    # Inverse of self, or None for zero. The backend is chosen with
+    # PLONK_INVERSE_BACKEND (see `INVERSE_BACKENDS`); in Montgomery form the
+    # raw inverse (a*R)^-1 is fixed up to a^-1*R with one multiply by R^2.
     @classmethod
     def inverse(cls,self):
-        if self == 0:
-             print("cannot invert 0!\n")
-             return  None
         u = self
         if type(self) != gmpy2.mpz:
             u = self.value
-        one =gmpy2.mpz(1)
-        v = cls.MODULUS
-        b = cls.R2
-        c = gmpy2.mpz(0)
-
-        while u != one and v != one:
-            while u & 1 == 0:
-                u = u // 2
-                if b & 1 == 0:
-                    b = b // 2
-                else:
-                    b = b + cls.MODULUS
-                    b = b // 2
-            while v & 1 == 0:
-                v =v // 2
-                if c & 1 == 0:
-                    c = c // 2
-                else:
-                    c = c + cls.MODULUS
-                    c = c // 2
-            if v < u:
-                u = u-v
-                if c > b:
-                    b = b + cls.MODULUS
-                b = b - c
-                b = gmpy2.f_mod(b, cls.MODULUS)
-            else:
-                v = v-u
-                if b > c:
-                    c = c + cls.MODULUS
-                c = c - b
-                c = gmpy2.f_mod(c, cls.MODULUS)
-        if u == one:
-            return cls(b)
-        else:
-            return cls(c)
+        if u == 0:
+            print("cannot invert 0!\n")
+            return None
+        res = _invert(u, cls.MODULUS)
+        if MONTGOMERY:
+            res = res * cls.R2 % cls.MODULUS
+        return cls(res)
     
     # Returns the 2^s root of unity.
     def two_adic_root_of_unity(self):
@@ -173,7 +272,7 @@ class field:
         # Compute the generator for the multiplicative subgroup.
         # It should be 2^(log_size_of_group) root of unity.
         omega = self.two_adic_root_of_unity()
-        R_inv=gmpy2.invert(self.R,self.MODULUS)
+        R_inv=gmpy2.invert(self.R,self.MODULUS) if MONTGOMERY else 1
         for _ in range(log_size_of_group, self.TWO_ADICITY):
             #modsquare
             omega *=omega
@@ -0,0 +1,212 @@
+import gmpy2
+from dataclasses import dataclass
+from field import MONTGOMERY,pow_fixup
+
+# A vector of field elements kept as raw values (same representation as
+# `field.value`) instead of one field object per element.
+# Operations work element-wise; the operand may be another FieldVector or a
+# single field element broadcast to every position. Method names mirror
+# `field`, so gate code runs over a whole domain when the vector is the receiver.
+@dataclass
+class FieldVector:
+    values: list
+    field_type: type
+
+    @classmethod
+    def from_list(cls, elems, field_type=None):
+        if isinstance(elems, FieldVector):
+            return elems
+        if field_type is None:
+            field_type = type(elems[0])
+        return cls([e.value for e in elems], field_type)
+
+    # Vector of the canonical integers `ints` (as `field.from_repr`, each below the modulus)
+    @classmethod
+    def from_canonical(cls, ints, field_type):
+        if MONTGOMERY:
+            m = field_type.MODULUS
+            r = field_type.R
+            return cls([gmpy2.mpz(x) * r % m for x in ints], field_type)
+        return cls([gmpy2.mpz(x) for x in ints], field_type)
+
+    # Vector of raw Montgomery-form integers (as `field.from_montgomery`)
+    @classmethod
+    def from_montgomery(cls, raws, field_type):
+        if MONTGOMERY:
+            return cls([gmpy2.mpz(x) for x in raws], field_type)
+        m = field_type.MODULUS
+        r_inv = field_type.R_INV
+        return cls([gmpy2.mpz(x) * r_inv % m for x in raws], field_type)
+
+    # Canonical integer of every element (as `field.into_repr`)
+    def to_canonical(self):
+        if MONTGOMERY:
+            m = self.field_type.MODULUS
+            r_inv = self.field_type.R_INV
+            return [x * r_inv % m for x in self.values]
+        return self.values[:]
+
+    @classmethod
+    def zeros(cls, size, field_type):
+        zero = field_type.zero().value
+        return cls([zero] * size, field_type)
+
+    def to_list(self):
+        cls = self.field_type
+        return [cls(v) for v in self.values]
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        cls = self.field_type
+        for v in self.values:
+            yield cls(v)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FieldVector(self.values[index], self.field_type)
+        return self.field_type(self.values[index])
+
+    def __setitem__(self, index, elem):
+        self.values[index] = elem.value
+
+    # Joins several vectors end to end
+    @staticmethod
+    def concat(vectors):
+        values = []
+        for v in vectors:
+            values.extend(v.values)
+        return FieldVector(values, vectors[0].field_type)
+
+    # Append raw values (same representation as `values`)
+    def extend_raw(self, values):
+        self.values.extend(values)
+
+    def pop(self):
+        return self.field_type(self.values.pop())
+
+    def extend(self, elems):
+        if isinstance(elems, FieldVector):
+            self.values.extend(elems.values)
+        else:
+            self.values.extend(e.value for e in elems)
+
+    # Returns the vector whose `i`-th element is `self[(i + k) % len(self)]`,
+    # i.e. the evaluations at `X * omega^k` when `self` holds evaluations over a domain.
+    def shift(self, k):
+        return FieldVector(self.values[k:] + self.values[:k], self.field_type)
+
+    # Multiplicative identity of the underlying field, as a single element.
+    def one(self):
+        return self.field_type.zero().one()
+
+    def add(self, b):
+        m = self.field_type.MODULUS
+        if isinstance(b, FieldVector):
+            res = [(x + y) % m for x, y in zip(self.values, b.values)]
+        else:
+            y = b.value
+            res = [(x + y) % m for x in self.values]
+        return FieldVector(res, self.field_type)
+
+    def sub(self, b):
+        m = self.field_type.MODULUS
+        if isinstance(b, FieldVector):
+            res = [(x - y) % m for x, y in zip(self.values, b.values)]
+        else:
+            y = b.value
+            res = [(x - y) % m for x in self.values]
+        return FieldVector(res, self.field_type)
+
+    def neg(self):
+        m = self.field_type.MODULUS
+        res = [(-x) % m for x in self.values]
+        return FieldVector(res, self.field_type)
+
+    def double(self):
+        return self.add(self)
+
+    # Add a chain of vectors (or field elements) with a single reduction at the end
+    def add_many(self, terms):
+        m = self.field_type.MODULUS
+        res = self.values[:]
+        for t in terms:
+            if isinstance(t, FieldVector):
+                res = [x + y for x, y in zip(res, t.values)]
+            else:
+                y = t.value
+                res = [x + y for x in res]
+        res = [x % m for x in res]
+        return FieldVector(res, self.field_type)
+
+    # Same as `field.mul` applied position by position.
+    def mul(self, b):
+        if not isinstance(b, FieldVector):
+            return self.scale(b)
+        m = self.field_type.MODULUS
+        if MONTGOMERY:
+            r_inv = self.field_type.R_INV
+            res = [x * y * r_inv % m for x, y in zip(self.values, b.values)]
+        else:
+            res = [x * y % m for x, y in zip(self.values, b.values)]
+        return FieldVector(res, self.field_type)
+
+    # Multiply every element by the single field element `c`.
+    def scale(self, c):
+        m = self.field_type.MODULUS
+        y = c.mul_operand()
+        res = [x * y % m for x in self.values]
+        return FieldVector(res, self.field_type)
+
+    def square(self):
+        return self.mul(self)
+
+    # Products of the elements before each position, [1, v0, v0*v1, ...],
+    # as the running product of a grand-product argument.
+    def prefix_products(self):
+        m = self.field_type.MODULUS
+        r_inv = self.field_type.R_INV if MONTGOMERY else 1
+        acc = self.one().value
+        res = []
+        for x in self.values:
+            res.append(acc)
+            acc = acc * x * r_inv % m
+        return FieldVector(res, self.field_type)
+
+    # Replaces every nonzero element x by coeff / x in place, with a single
+    # field inversion (Montgomery's trick); zeros are left as they are.
+    def batch_inverse_and_mul(self, coeff):
+        cls = self.field_type
+        m = cls.MODULUS
+        r_inv = cls.R_INV if MONTGOMERY else 1
+        values = self.values
+        one = self.one().value
+        prods = []
+        acc = one
+        for x in values:
+            if x != 0:
+                acc = acc * x * r_inv % m
+                prods.append(acc)
+        inv = cls.inverse(cls(acc)).mul(coeff).value
+        j = len(prods) - 1
+        for i in range(len(values) - 1, -1, -1):
+            x = values[i]
+            if x != 0:
+                j -= 1
+                before = prods[j] if j >= 0 else one
+                values[i] = inv * before * r_inv % m
+                inv = inv * x * r_inv % m
+
+    # Element-wise self^exp. The S-box power x^5 = (x^2)^2 * x is written out
+    # and reduced once; other exponents use GMP's sliding-window powmod.
+    def pow(self, exp):
+        if exp == 0:
+            return FieldVector([self.one().value] * len(self), self.field_type)
+        m = self.field_type.MODULUS
+        fixup = pow_fixup(self.field_type, exp)
+        if exp == 5:
+            res = [(t := x * x) * t * x * fixup % m for x in self.values]
+        else:
+            res = [gmpy2.powmod(x, exp, m) * fixup % m for x in self.values]
+        return FieldVector(res, self.field_type)
@@ -0,0 +1,175 @@
+import os
+import struct
+import hashlib
+import gmpy2
+from bls12_381 import fq, fr
+from msm import AFFINE_ADD_COST, JACOBIAN_ADD_COST, MAX_WINDOW_SIZE, batch_inverse, signed_digits, reduce_buckets, bucket_sum
+
+# Memory budget, in MiB, for the fixed-base table of `powers_of_g`.
+# 0 (the default) disables the table and every commitment uses the generic MSM.
+MEMORY_BUDGET_MB = int(os.environ.get("PLONK_FIXED_BASE_MB", "0"))
+
+# Approximate in-memory size of one table entry: a tuple of two 381-bit mpz
+ENTRY_BYTES = 256
+
+MAGIC = b"PLONKFBT"
+HEADER = struct.Struct("<8sIIII32s")
+COORD_BYTES = 48
+
+def encode_coord(v):
+    return int(v).to_bytes(COORD_BYTES, "little")
+
+def decode_coord(b):
+    return gmpy2.mpz(int.from_bytes(b, "little"))
+
+# Canonical (x, y) of an affine point, None for the point at infinity
+def canonical_point(p):
+    if p.is_zero():
+        return None
+    return (p.x.into_repr(), p.y.into_repr())
+
+# Hash of the bases a table was built for, stored with the table on disk
+def bases_digest(points):
+    h = hashlib.sha256()
+    for p in points:
+        if p is None:
+            h.update(bytes(2 * COORD_BYTES))
+        else:
+            h.update(encode_coord(p[0]) + encode_coord(p[1]))
+    return h.digest()
+
+# Replace every point by its double, sharing one inversion across all of them
+def double_all(points, modulus):
+    m = modulus
+    idx = [i for i, p in enumerate(points) if p is not None]
+    inverses = batch_inverse([2 * points[i][1] % m for i in idx], m)
+    for i, inv in zip(idx, inverses):
+        x, y = points[i]
+        lam = 3 * x * x * inv % m
+        x3 = (lam * lam - 2 * x) % m
+        y3 = (lam * (x - x3) - y) % m
+        points[i] = (x3, y3)
+    return points
+
+# Precomputed multiples 2^(c*w) * P_i of fixed bases P_i, one per window w.
+# With them an MSM needs no doublings: every signed digit of every scalar
+# selects one table entry, and all windows share a single set of 2^(c-1) buckets.
+class FixedBaseTable:
+    def __init__(self, c, num_windows, entries, digest):
+        self.c = c
+        self.num_windows = num_windows
+        # entries[i * num_windows + w] = 2^(c*w) * P_i as canonical (x, y), or None
+        self.entries = entries
+        self.digest = digest
+
+    def __len__(self):
+        return len(self.entries) // self.num_windows
+
+    # Window size minimising the estimated MSM cost over `size` bases among
+    # those whose table fits in `memory_budget` bytes; None if none fits
+    @staticmethod
+    def window_size(size, memory_budget):
+        num_bits = fr.Fr.MODULUS_BITS
+        best_c = None
+        best_cost = None
+        for c in range(1, MAX_WINDOW_SIZE + 1):
+            num_windows = num_bits // c + 1
+            if size * num_windows * ENTRY_BYTES > memory_budget:
+                continue
+            cost = size * num_windows * AFFINE_ADD_COST + (1 << c) * JACOBIAN_ADD_COST
+            if best_cost is None or cost < best_cost:
+                best_c, best_cost = c, cost
+        return best_c
+
+    @classmethod
+    def build(cls, bases, c):
+        m = fq.Fq.MODULUS
+        num_windows = fr.Fr.MODULUS_BITS // c + 1
+        points = [canonical_point(b) for b in bases]
+        digest = bases_digest(points)
+        entries = [None] * (len(points) * num_windows)
+        for w in range(num_windows):
+            for i, p in enumerate(points):
+                entries[i * num_windows + w] = p
+            if w + 1 < num_windows:
+                for _ in range(c):
+                    double_all(points, m)
+        return cls(c, num_windows, entries, digest)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, 1, self.c, self.num_windows, len(self), self.digest))
+            zero = bytes(2 * COORD_BYTES)
+            for e in self.entries:
+                if e is None:
+                    f.write(zero)
+                else:
+                    f.write(encode_coord(e[0]) + encode_coord(e[1]))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, c, num_windows, size, digest = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != 1:
+            raise ValueError(f"{path} is not a fixed-base table")
+        entries = [None] * (size * num_windows)
+        pos = HEADER.size
+        step = 2 * COORD_BYTES
+        for i in range(len(entries)):
+            x = decode_coord(data[pos:pos + COORD_BYTES])
+            y = decode_coord(data[pos + COORD_BYTES:pos + step])
+            if x != 0 or y != 0:
+                entries[i] = (x, y)
+            pos += step
+        return cls(c, num_windows, entries, digest)
+
+    # Table for `bases` within `memory_budget` bytes (default PLONK_FIXED_BASE_MB).
+    # Reuses the table saved at `path` when it was built for the same bases and
+    # window size, otherwise builds it and saves it there. None if the budget
+    # is too small for any window size.
+    @classmethod
+    def for_bases(cls, bases, path=None, memory_budget=None):
+        if memory_budget is None:
+            memory_budget = MEMORY_BUDGET_MB << 20
+        c = cls.window_size(len(bases), memory_budget)
+        if c is None:
+            return None
+        if path is not None and os.path.exists(path):
+            table = cls.load(path)
+            if table.c == c and len(table) == len(bases) and \
+                    table.digest == bases_digest([canonical_point(b) for b in bases]):
+                return table
+        table = cls.build(bases, c)
+        if path is not None:
+            table.save(path)
+        return table
+
+    # Table over the first `size` bases only
+    def prefix(self, size):
+        return FixedBaseTable(self.c, self.num_windows,
+                              self.entries[:size * self.num_windows], self.digest)
+
+    # Whether the table holds bases offset .. offset + size - 1
+    def covers(self, offset, size):
+        return offset + size <= len(self)
+
+    # sum(scalars[i] * P_(offset + i)) for plain integer scalars
+    def msm(self, scalars, offset=0):
+        m = fq.Fq.MODULUS
+        W = self.num_windows
+        digits = signed_digits(scalars, self.c, W)
+        buckets = [[] for _ in range(1 << (self.c - 1))]
+        for w, window_digits in enumerate(digits):
+            for i, d in enumerate(window_digits):
+                if d == 0:
+                    continue
+                e = self.entries[(offset + i) * W + w]
+                if e is None:
+                    continue
+                if d > 0:
+                    buckets[d - 1].append(e)
+                else:
+                    buckets[-d - 1].append((e[0], (m - e[1]) % m))
+        reduce_buckets(buckets, m)
+        return bucket_sum(buckets)
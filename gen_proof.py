@@ -1,22 +1,92 @@
 import gmpy2
 import itertools
+from dataclasses import dataclass
 from domain import Radix2EvaluationDomain
 from transcript import transcript
 from composer import StandardComposer
 from transcript import transcript
 from plonk_core.lookup import multiset
 from plonk_core.src.permutation import mod 
-from plonk_core.src.proof_system.prover_key import Prover_Key
+from plonk_core.src.proof_system.prover_key import Prover_Key,FIXED_COMMITMENTS
 from plonk_core.src.proof_system.pi import into_dense_poly
 from plonk_core.src.proof_system import quotient_poly
 from plonk_core.src.proof_system import linearisation_poly
-from arithmetic import INTT,from_coeff_vec,resize
-from load import read_scalar_data
+from arithmetic import INTT,from_coeff_vec
+from plonk_core.src.proof_system.quotient_poly import compute_first_lagrange_poly_scaled
+from arithmetic import coset_NTT
+import msm
+from load import read_scalar_data,witness_path,load_async,resolve
+from field_vector import FieldVector
 from KZG import kzg10
 from bls12_381 import fq,fr
-
-
-def gen_proof(pp, pk: Prover_Key, cs: StandardComposer, transcript: transcript.Transcript):
+import parallel
+
+# Everything the prover derives from the prover key and the circuit alone.
+# It is the same for every witness, so batches compute it once (see `precompute`).
+@dataclass
+class ProofPrecomputation:
+    domain_8n: Radix2EvaluationDomain
+    # Evaluations of the first lagrange polynomial over the 8n coset
+    l1_eval_8n: FieldVector
+
+def precompute(pp, pk: Prover_Key, cs: StandardComposer):
+    Fr = fr.Fr(value = gmpy2.mpz(0))
+    domain = Radix2EvaluationDomain.new(cs.circuit_bound(),Fr)
+    domain_8n = Radix2EvaluationDomain.new(8 * domain.size,Fr)
+    l1_poly = compute_first_lagrange_poly_scaled(domain, Fr.one())
+    l1_eval_8n = coset_NTT(FieldVector.from_list(l1_poly, fr.Fr), domain_8n)
+    # Kept on the prover key, so workers receiving pk get them as well
+    pk.permutation.sigma_evaluations(domain)
+    pk.v_h_coset_8n_inverse(domain_8n.size)
+    fixed_commitments(pp, pk, domain)
+    return ProofPrecomputation(domain_8n, l1_eval_8n)
+
+# The SRS is identified by its first two powers of g, g and beta * g
+def srs_fingerprint(pp):
+    return [pp.powers_of_g[0], pp.powers_of_g[1]]
+
+def same_points(a, b):
+    if a is None or len(a) != len(b):
+        return False
+    return all(p.x.into_repr() == q.x.into_repr() and p.y.into_repr() == q.y.into_repr()
+               for p, q in zip(a, b))
+
+# Commitments to the sigma polynomials and the interpolated lookup table
+# columns (see `FIXED_COMMITMENTS`), computed once and kept on the prover key
+# together with the fingerprint of `pp`. Commitments stored for another SRS
+# (or without a fingerprint) are computed again.
+def fixed_commitments(pp, pk: Prover_Key, domain: Radix2EvaluationDomain):
+    fingerprint = srs_fingerprint(pp)
+    if pk.fixed_commitments is None or not same_points(pk.fixed_commitments_srs, fingerprint):
+        sigmas = [pk.permutation.left_sigma, pk.permutation.right_sigma,
+                  pk.permutation.out_sigma, pk.permutation.fourth_sigma]
+        tables = [pk.lookup.table_1, pk.lookup.table_2, pk.lookup.table_3, pk.lookup.table_4]
+        polys = [sigma[0] for sigma in sigmas] + [from_coeff_vec(INTT(domain, table)) for table in tables]
+        labeled_polys = [kzg10.LabeledPoly.new(label=label, hiding_bound=None, poly=poly)
+                         for label, poly in zip(FIXED_COMMITMENTS, polys)]
+        commits, _ = kzg10.commit_poly(pp, labeled_polys, fr.Fr(value = gmpy2.mpz(0)))
+        pk.fixed_commitments = [c.commitment.value for c in commits]
+        pk.fixed_commitments_srs = fingerprint
+    return pk.fixed_commitments
+
+# Commitment to the compressed table polynomial. Compression is linear,
+# t = t_1 + zeta * t_2 + zeta^2 * t_3 + zeta^3 * t_4, so the commitment is the
+# same combination of the table column commitments: a 4-point MSM.
+def table_commitment(pk: Prover_Key, zeta: fr.Fr):
+    scalars = []
+    power = zeta.one()
+    for _ in range(4):
+        scalars.append(power.into_repr())
+        power = power.mul(zeta)
+    return kzg10.Commitment(value=msm.msm(pk.fixed_commitments[4:8], scalars).to_affine())
+
+# `pk` may also be a Future from `load.load_async`; it is only waited for
+# once the witness polynomials are committed.
+# `witness_files` lists the w_l, w_r, w_o and w_4 files; by default the
+# w_*_scalar files of the working directory are used (see `load.witness_path`).
+# `precomputed` is the result of `precompute` for pk and cs, computed here if not given.
+def gen_proof(pp, pk: Prover_Key, cs: StandardComposer, transcript: transcript.Transcript,
+              witness_files=None, precomputed: ProofPrecomputation = None):
     #init Fr params (FFTfield)
     Fr=fr.Fr(value = gmpy2.mpz(0))
     #get FFT domaim
@@ -24,30 +94,48 @@ def gen_proof(pp, pk: Prover_Key, cs: StandardComposer, transcript: transcript.T
     n=domain.size
     transcript.append_pi(b"pi")
 
-    #1. Compute witness Polynomials
-    w_l_scalar=read_scalar_data("w_l_scalar.txt")
-    w_r_scalar=read_scalar_data("w_r_scalar.txt")
-    w_o_scalar=read_scalar_data("w_o_scalar.txt")
-    w_4_scalar=read_scalar_data("w_4_scalar.txt")
-
-    # w_l_poly = INTT(domain,w_l_scalar)
-    # w_r_poly = INTT(domain,w_r_scalar)
-    # w_o_poly = INTT(domain,w_o_scalar)
-    # w_4_poly = INTT(domain,w_4_scalar)
-
-    w_l_poly = from_coeff_vec(INTT(domain,w_l_scalar))
-    w_r_poly = from_coeff_vec(INTT(domain,w_r_scalar))
-    w_o_poly = from_coeff_vec(INTT(domain,w_o_scalar))
-    w_4_poly = from_coeff_vec(INTT(domain,w_4_scalar))
+    # Commitments known so far in this proof, see `kzg10.CommitmentRegistry`
+    registry = kzg10.CommitmentRegistry()
 
-    w_polys = [kzg10.LabeledPoly.new(label="w_l_poly",hiding_bound=None,poly=w_l_poly),kzg10.LabeledPoly.new(label="w_r_poly",hiding_bound=None,poly=w_r_poly),
-               kzg10.LabeledPoly.new(label="w_o_poly",hiding_bound=None,poly=w_o_poly),kzg10.LabeledPoly.new(label="w_4_poly",hiding_bound=None,poly=w_4_poly)]
-    w_commits, w_rands = kzg10.commit_poly(pp,w_polys,Fr)
+    #1. Compute witness Polynomials
+    # All four witness columns start loading at once; the INTT and commitment
+    # of each wire run as soon as its column is in, while the others still load
+    wire_names = ["w_l", "w_r", "w_o", "w_4"]
+    if witness_files is None:
+        witness_files = [witness_path(name + "_scalar") for name in wire_names]
+    wire_loads = [load_async(read_scalar_data, filename) for filename in witness_files]
+
+    w_scalars = []
+    w_polys = []
+    w_commits = []
+    w_rands = []
+    for name, wire_load in zip(wire_names, wire_loads):
+        w_scalar = wire_load.result()
+        w_poly = from_coeff_vec(INTT(domain,w_scalar))
+        labeled_poly = kzg10.LabeledPoly.new(label=name + "_poly",hiding_bound=None,poly=w_poly)
+        w_commit, w_rand = kzg10.commit_poly(pp,[labeled_poly],Fr,registry)
+        w_scalars.append(w_scalar)
+        w_polys.append(labeled_poly)
+        w_commits.extend(w_commit)
+        w_rands.extend(w_rand)
+
+    w_l_scalar, w_r_scalar, w_o_scalar, w_4_scalar = w_scalars
+    w_l_poly, w_r_poly, w_o_poly, w_4_poly = [p.poly for p in w_polys]
 
     transcript.append(b"w_l",w_commits[0].commitment.value)
     transcript.append(b"w_r",w_commits[1].commitment.value)
     transcript.append(b"w_o",w_commits[2].commitment.value)
     transcript.append(b"w_4",w_commits[3].commitment.value)
+
+    # The prover key may still be loading (see `load.load_async`)
+    pk = resolve(pk)
+    if precomputed is None:
+        precomputed = precompute(pp, pk, cs)
+    sigmas = [pk.permutation.left_sigma, pk.permutation.right_sigma,
+              pk.permutation.out_sigma, pk.permutation.fourth_sigma]
+    for sigma, commitment in zip(sigmas, pk.fixed_commitments[:4]):
+        registry.register(sigma[0], kzg10.Commitment(value=commitment))
+
     #2. Derive lookup polynomials
 
     # Generate table compression factor
@@ -61,6 +149,7 @@ def gen_proof(pp, pk: Prover_Key, cs: StandardComposer, transcript: transcript.T
     #Compute table poly
     compressed_t_poly = INTT(domain,compressed_t_multiset.elements)
     table_poly = from_coeff_vec(compressed_t_poly)
+    registry.register(table_poly, table_commitment(pk, zeta))
 
     # Compute query table f
     # When q_lookup[i] is zero the wire value is replaced with a dummy
@@ -94,7 +183,7 @@ def gen_proof(pp, pk: Prover_Key, cs: StandardComposer, transcript: transcript.T
     f_polys = [kzg10.LabeledPoly.new(label="f_poly",hiding_bound=None,poly=f_poly)]
 
     # Commit to query polynomial
-    f_poly_commit, _ = kzg10.commit_poly(pp,f_polys,Fr)
+    f_poly_commit, _ = kzg10.commit_poly(pp,f_polys,Fr,registry)
     transcript.append(b"f",f_poly_commit[0].commitment.value)
 
     # Compute s, as the sorted and concatenated version of f and t
@@ -109,8 +198,8 @@ def gen_proof(pp, pk: Prover_Key, cs: StandardComposer, transcript: transcript.T
     # Commit to h polys
     h_1_polys = [kzg10.LabeledPoly.new(label="h_1_poly",hiding_bound=None,poly=h_1_poly)]
     h_2_polys = [kzg10.LabeledPoly.new(label="h_1_poly",hiding_bound=None,poly=h_2_poly)]
-    h_1_poly_commit,_ = kzg10.commit_poly(pp,h_1_polys,Fr)
-    h_2_poly_commit,_ = kzg10.commit_poly(pp,h_2_polys,Fr)
+    h_1_poly_commit,_ = kzg10.commit_poly(pp,h_1_polys,Fr,registry)
+    h_2_poly_commit,_ = kzg10.commit_poly(pp,h_2_polys,Fr,registry)
 
     # Add h polynomials to transcript
     transcript.append(b"h1", h_1_poly_commit[0].commitment.value)
@@ -148,10 +237,11 @@ def gen_proof(pp, pk: Prover_Key, cs: StandardComposer, transcript: transcript.T
             pk.permutation.right_sigma[0],
             pk.permutation.out_sigma[0],
             pk.permutation.fourth_sigma[0]
-        ))
+        ),
+        pk.permutation.sigma_evaluations(domain))
     # Commit to permutation polynomial.
     z_polys = [kzg10.LabeledPoly.new(label="z_poly",hiding_bound=None,poly=z_poly)]
-    z_poly_commit,_ = kzg10.commit_poly(pp,z_polys,Fr)
+    z_poly_commit,_ = kzg10.commit_poly(pp,z_polys,Fr,registry)
 
     # Add permutation polynomial commitment to transcript.
     transcript.append(b"z", z_poly_commit[0].commitment.value)
@@ -170,7 +260,7 @@ def gen_proof(pp, pk: Prover_Key, cs: StandardComposer, transcript: transcript.T
 
     # Commit to lookup permutation polynomial.
     z_2_polys = [kzg10.LabeledPoly.new(label="z_2_poly",hiding_bound=None,poly=z_2_poly)]
-    z_2_poly_commit,_ = kzg10.commit_poly(pp,z_2_polys,Fr)
+    z_2_poly_commit,_ = kzg10.commit_poly(pp,z_2_polys,Fr,registry)
 
     # 3. Compute public inputs polynomial
     pi_poly = into_dense_poly(cs.public_inputs,cs.intended_pi_pos,n,Fr)
@@ -206,7 +296,9 @@ def gen_proof(pp, pk: Prover_Key, cs: StandardComposer, transcript: transcript.T
         range_sep_challenge,logic_sep_challenge,
         fixed_base_sep_challenge,
         var_base_sep_challenge,
-        lookup_sep_challenge)
+        lookup_sep_challenge,
+        precomputed.domain_8n,
+        precomputed.l1_eval_8n)
 
     t_i_poly = split_tx_poly(n, t_poly)
 
@@ -219,7 +311,7 @@ def gen_proof(pp, pk: Prover_Key, cs: StandardComposer, transcript: transcript.T
                  kzg10.LabeledPoly.new(label="t_i_polys[6]",hiding_bound=None,poly=t_i_poly[6]),
                  kzg10.LabeledPoly.new(label="t_i_polys[7]",hiding_bound=None,poly=t_i_poly[7])]
     
-    t_commits, _ = kzg10.commit_poly(pp,t_i_polys,Fr)
+    t_commits, _ = kzg10.commit_poly(pp,t_i_polys,Fr,registry)
 
     # Add quotient polynomial commitments to transcript
     transcript.append(b"t_1", t_commits[0].commitment.value)
@@ -261,7 +353,8 @@ def gen_proof(pp, pk: Prover_Key, cs: StandardComposer, transcript: transcript.T
             f_poly,
             h_1_poly,
             h_2_poly,
-            table_poly)
+            table_poly,
+            w_scalars)
     
     # Add evaluations to transcript.
     # First wire evals
@@ -310,7 +403,7 @@ def gen_proof(pp, pk: Prover_Key, cs: StandardComposer, transcript: transcript.T
                 kzg10.LabeledPoly.new(label="h_2_poly",hiding_bound=None,poly=h_2_poly),
                 kzg10.LabeledPoly.new(label="table_poly",hiding_bound=None,poly=table_poly)]
     
-    aw_commits, aw_rands = kzg10.commit_poly(pp,aw_polys,Fr)
+    aw_commits, aw_rands = kzg10.commit_poly(pp,aw_polys,Fr,registry)
     aw_opening = kzg10.open(
         pp,
         itertools.chain(aw_polys, w_polys),
@@ -330,7 +423,7 @@ def gen_proof(pp, pk: Prover_Key, cs: StandardComposer, transcript: transcript.T
                  kzg10.LabeledPoly.new(label="z_2_poly",hiding_bound=None,poly=z_2_poly),
                  kzg10.LabeledPoly.new(label="table_poly",hiding_bound=None,poly=table_poly)]
     
-    saw_commits, saw_rands = kzg10.commit_poly(pp,saw_polys,Fr)
+    saw_commits, saw_rands = kzg10.commit_poly(pp,saw_polys,Fr,registry)
     saw_opening = kzg10.open(
         pp,
         saw_polys,
@@ -364,10 +457,42 @@ def gen_proof(pp, pk: Prover_Key, cs: StandardComposer, transcript: transcript.T
             evaluations = evaluations)
     return Proof
 
+# Per-process state of the `gen_proof_batch` workers
+_batch_state = None
+
+def _init_batch_worker(pp, pk, cs, precomputed):
+    global _batch_state
+    _batch_state = (pp, pk, cs, precomputed)
+
+def _prove_in_worker(transcript_init, witness_files):
+    pp, pk, cs, precomputed = _batch_state
+    return gen_proof(pp, pk, cs, transcript.Transcript.new(transcript_init),
+                     witness_files, precomputed)
+
+# Prove every entry of `witnesses` (each a list of the w_l, w_r, w_o and w_4
+# files) for the same circuit, returning the proofs in order. The
+# witness-independent data is computed once for the whole batch.
+# With `workers` above 1 the proofs run in that many worker processes, which
+# receive pp, pk and cs once each; their proof stages then run serially.
+def gen_proof_batch(pp, pk: Prover_Key, cs: StandardComposer, witnesses,
+                    transcript_init=b"Merkle tree", workers=1):
+    pk = resolve(pk)
+    precomputed = precompute(pp, pk, cs)
+    workers = min(workers, len(witnesses))
+    if workers <= 1:
+        return [gen_proof(pp, pk, cs, transcript.Transcript.new(transcript_init),
+                          witness_files, precomputed)
+                for witness_files in witnesses]
+
+    with parallel.new_pool(workers, _init_batch_worker, (pp, pk, cs, precomputed)) as pool:
+        futures = [pool.submit(_prove_in_worker, transcript_init, witness_files)
+                   for witness_files in witnesses]
+        return [f.result() for f in futures]
+
 
 def split_tx_poly(n, t_x):
     buf:list = t_x[:]
-    buf = resize(buf, n << 3, fr.Fr.zero())
+    buf.extend([fr.Fr.zero()] * ((n << 3) - len(buf)))
     return [
         from_coeff_vec(buf[0:n]),
         from_coeff_vec(buf[n:2 * n]),
@@ -1,18 +1,132 @@
+import os
+import time
+import pickle
+import hashlib
 import gmpy2
 import re
+import field
+from concurrent.futures import ThreadPoolExecutor, Future
 from structure import AffinePointG1,AffinePointG2,G2Coordinate,UniversalParams
 from bls12_381 import fq,fr
 from plonk_core.src.proof_system.prover_key import Prover_Key
 from plonk_core.src.proof_system.widget.arithmetic import Arith
 from plonk_core.src.proof_system.widget.lookup import Lookup
 from plonk_core.src.proof_system.permutation import Permutation
+from field_vector import FieldVector
+from fixed_base import FixedBaseTable
+import srs
+import prover_key_file
+import witness_file
 def parse_bigint(s):
     start = s.find('"(') + 2
     end = s.find(')')
     bigint_str = s[start:end]
     return gmpy2.mpz(bigint_str,16)
 
+# Threads used to load files in the background
+LOAD_THREADS = 4
+
+_executor = None
+
+# Run `fn(*args)` on the loader thread pool and return its Future, so that
+# several files load at once and proving can start before all of them are in
+def load_async(fn, *args):
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=LOAD_THREADS)
+    return _executor.submit(fn, *args)
+
+# The value of `value`, waiting for it first if it is a Future from `load_async`
+def resolve(value):
+    if isinstance(value, Future):
+        return value.result()
+    return value
+
+# On-disk cache of decoded inputs, see `cached_read`
+CACHE_DIR = os.environ.get("PLONK_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "py_plonk"))
+CACHE_MAX_MB = int(os.environ.get("PLONK_CACHE_MAX_MB", "2048"))
+CACHE_MAX_AGE_DAYS = float(os.environ.get("PLONK_CACHE_MAX_AGE_DAYS", "30"))
+# Bump when the layout of cached objects changes
+CACHE_VERSION = 1
+
+def file_digest(filename):
+    h = hashlib.sha256()
+    with open(filename, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def is_binary_input(filename):
+    return srs.is_binary_srs(filename) or prover_key_file.is_binary_prover_key(filename) \
+        or witness_file.is_binary_witness(filename)
+
+# Remove cache entries older than CACHE_MAX_AGE_DAYS, then the least recently
+# used ones until the cache fits in CACHE_MAX_MB. Several loads may evict the
+# same directory at once, so entries that are already gone are skipped.
+def evict_cache(cache_dir=None):
+    cache_dir = CACHE_DIR if cache_dir is None else cache_dir
+    if not os.path.isdir(cache_dir):
+        return
+    now = time.time()
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".pickle"):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            st = os.stat(path)
+            if now - st.st_mtime > CACHE_MAX_AGE_DAYS * 86400:
+                os.remove(path)
+                continue
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= CACHE_MAX_MB << 20:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+# `reader(filename)` through the on-disk cache. The decoded result is pickled
+# under CACHE_DIR, keyed by the reader, the file content hash and the field
+# backend, and later reads of the same content load the snapshot instead of
+# parsing. Binary inputs are already fast to open and are read directly.
+def cached_read(reader, filename, cache_dir=None):
+    cache_dir = CACHE_DIR if cache_dir is None else cache_dir
+    if is_binary_input(filename):
+        return reader(filename)
+
+    key = f"{reader.__name__}-{file_digest(filename)}-{field.BACKEND}-v{CACHE_VERSION}"
+    path = os.path.join(cache_dir, key + ".pickle")
+    # The entry may be evicted by a concurrent load between the check and the
+    # read, in which case the file is parsed again
+    try:
+        with open(path, "rb") as file:
+            value = pickle.load(file)
+        # Mark as recently used
+        os.utime(path)
+        return value
+    except FileNotFoundError:
+        pass
+
+    value = reader(filename)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    evict_cache(cache_dir)
+    return value
+
+# Reads the SRS from `filename`, either the text format or the binary format
+# of `srs.write_srs` (memory-mapped, see `srs.read_srs`)
 def read_pp_data(filename):
+    if srs.is_binary_srs(filename):
+        return srs.read_srs(filename)
     # 打开文本文件以读取数据
     with open(filename, "r") as file:
         data = file.read()
@@ -33,30 +147,41 @@ def read_pp_data(filename):
             if current_section == "powers_of_g":
                 x_str = values[1]
                 y_str = values[2]
-                G1_point= AffinePointG1(x=fq.Fq(value=parse_bigint(x_str)),y=fq.Fq(value=parse_bigint(y_str)))
+                G1_point= AffinePointG1(x=fq.Fq.from_montgomery(parse_bigint(x_str)),y=fq.Fq.from_montgomery(parse_bigint(y_str)))
                 powers_of_g.append(G1_point)
             elif current_section == "powers_of_gamma_g":
                 x_str = values[1]
                 y_str = values[2]
-                G1_point= AffinePointG1(x=fq.Fq(value=parse_bigint(x_str)),y=fq.Fq(value=parse_bigint(y_str)))
+                G1_point= AffinePointG1(x=fq.Fq.from_montgomery(parse_bigint(x_str)),y=fq.Fq.from_montgomery(parse_bigint(y_str)))
                 powers_of_gamma_g.append(G1_point)
             elif current_section == "h":
-                h.x.c0 = fq.Fq(value=parse_bigint(values[1]))
-                h.x.c1 = fq.Fq(value=parse_bigint(values[2]))
-                h.y.c0 = fq.Fq(value=parse_bigint(values[3]))
-                h.y.c1 = fq.Fq(value=parse_bigint(values[4]))
+                h.x.c0 = fq.Fq.from_montgomery(parse_bigint(values[1]))
+                h.x.c1 = fq.Fq.from_montgomery(parse_bigint(values[2]))
+                h.y.c0 = fq.Fq.from_montgomery(parse_bigint(values[3]))
+                h.y.c1 = fq.Fq.from_montgomery(parse_bigint(values[4]))
                 
             elif current_section == "beta_h":
-                beta_h.x.c0 = fq.Fq(value=parse_bigint(values[1]))
-                beta_h.x.c1 = fq.Fq(value=parse_bigint(values[2]))
-                beta_h.y.c0 = fq.Fq(value=parse_bigint(values[3]))
-                beta_h.y.c1 = fq.Fq(value=parse_bigint(values[4]))
+                beta_h.x.c0 = fq.Fq.from_montgomery(parse_bigint(values[1]))
+                beta_h.x.c1 = fq.Fq.from_montgomery(parse_bigint(values[2]))
+                beta_h.y.c0 = fq.Fq.from_montgomery(parse_bigint(values[3]))
+                beta_h.y.c1 = fq.Fq.from_montgomery(parse_bigint(values[4]))
                 
     pp = UniversalParams(powers_of_g, powers_of_gamma_g, h, beta_h)
     return pp
 
+# Attach the fixed-base table of `pp.powers_of_g`, persisted next to the SRS file
+# as `<filename>.fbt`. Leaves `pp` unchanged when the memory budget
+# (PLONK_FIXED_BASE_MB by default) is too small for a table.
+def read_fixed_base_table(pp, filename, memory_budget=None):
+    pp.powers_of_g_table = FixedBaseTable.for_bases(pp.powers_of_g, filename + ".fbt", memory_budget)
+    return pp
+
+# Reads the prover key from `filename`, either the text format or the binary
+# format of `prover_key_file.write_prover_key` (sections loaded on first access)
 def read_pk_data(filename):
-    
+    if prover_key_file.is_binary_prover_key(filename):
+        return prover_key_file.read_prover_key(filename)
+
     with open(filename, "r") as file:
         lines = file.readlines()
 
@@ -239,6 +364,16 @@ def read_pk_data(filename):
             elif subsubkey:
                 subsubkey="evals"
                 data[current_key][subkey][subsubkey].append(value)
+
+    # Keep the 8n evaluations packed, the quotient computation works on whole vectors
+    for section in data.values():
+        if not isinstance(section, dict):
+            continue
+        for subkey, entry in section.items():
+            if subkey == "evals":
+                section[subkey] = FieldVector.from_list(entry, fr.Fr)
+            elif isinstance(entry, dict) and "evals" in entry:
+                entry["evals"] = FieldVector.from_list(entry["evals"], fr.Fr)
     
     arithmetic = Arith(q_m=(data["arithmetic"]["q_m"]["coeffs"],data["arithmetic"]["q_m"]["evals"]),
                        q_l=(data["arithmetic"]["q_l"]["coeffs"],data["arithmetic"]["q_l"]["evals"]),
@@ -282,7 +417,7 @@ def read_cs_data(filename):
     pi = match.group(1)
     public_inputs_list = [gmpy2.mpz(x) for x in pi.split(',')]
     public_inputs = (public_inputs_list[3] << 192) | (public_inputs_list[2] << 128) | (public_inputs_list[1] << 64) | public_inputs_list[0]
-    public_inputs = fr.Fr(value=public_inputs)
+    public_inputs = fr.Fr.from_montgomery(public_inputs)
     data = {}
     data["n"]=n
     data["intended_pi_pos"]=eval(intended_pi_pos)
@@ -298,43 +433,47 @@ def read_cs_data(filename):
             data[current_key]=[]
         elif line.startswith("Fp"):
             value = parse_bigint(line)
-            value = fr.Fr(value=value)
+            value = fr.Fr.from_montgomery(value)
             data[current_key].append(value)
         else:
             data[current_key].append(int(line))
     return data
 
-def read_scalar_data(filename):
-    with open(filename, "r") as file:
-        content = file.read()
-
-    # 使用正则表达式匹配包含列表的字符串
-    pattern = r'\[.*?\]'
-    matches = re.findall(pattern, content)
-
-    big_list = []
+# Number of witness values handed out per chunk by the streaming readers
+WITNESS_CHUNK = 1 << 14
 
-    # 如果第一个元素不符合正则表达式，手动添加到大列表
-    if content.startswith('Fp256'):
-        str_list=content.split('Fp256(BigInteger256(')[1].split(')')[0]
-        element_str = str_list.strip('[]')
-        elements = [gmpy2.mpz(e) for e in element_str.split(',')]
-        combined_value = 0
-        for u64_element in reversed(elements):
-            combined_value = (combined_value << 64) | u64_element
-        big_list.append(fr.Fr(value=gmpy2.mpz(combined_value)))
+# Stream the values of a text witness file (`Fp256(BigInteger256([l0, l1, l2, l3]))`
+# entries, u64 limbs least significant first, Montgomery form) in chunks of
+# raw integers, without holding the whole file in memory
+def iter_scalar_chunks(filename, chunk_size=WITNESS_CHUNK):
+    chunk = []
+    with open(filename, "r") as file:
+        for line in file:
+            start = line.find("[")
+            while start >= 0:
+                end = line.find("]", start)
+                l0, l1, l2, l3 = line[start + 1:end].split(",")
+                chunk.append(int(l0) | int(l1) << 64 | int(l2) << 128 | int(l3) << 192)
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+                start = line.find("[", end)
+    if chunk:
+        yield chunk
 
-    matches.pop(0)
+# Reads a witness column into a FieldVector, from the text format or the
+# binary format of `witness_file.write_witness`
+def read_scalar_data(filename):
+    if witness_file.is_binary_witness(filename):
+        return witness_file.read_witness(filename)
+    values = FieldVector([], fr.Fr)
+    for chunk in iter_scalar_chunks(filename):
+        values.extend_raw(FieldVector.from_montgomery(chunk, fr.Fr).values)
+    return values
 
-    # 遍历匹配的字符串列表并处理
-    for match in matches:
-        # 去除字符串中的方括号，并按逗号分割成元素列表
-        elements_str = match.strip('[]')
-        elements = [gmpy2.mpz(e) for e in elements_str.split(',')]
-        # 将元素列表作为子列表追加到大列表中
-        # 将元素列表合并成一个256位整数
-        combined_value = 0
-        for u64_element in reversed(elements):
-            combined_value = (combined_value << 64) | u64_element
-        big_list.append(fr.Fr(value=gmpy2.mpz(combined_value)))
-    return big_list
\ No newline at end of file
+# Path of the witness column `name` (e.g. "w_l_scalar"): the binary file
+# `<name>.bin` when it exists, otherwise the text file `<name>.txt`
+def witness_path(name):
+    if os.path.exists(name + ".bin"):
+        return name + ".bin"
+    return name + ".txt"
@@ -0,0 +1,172 @@
+import gmpy2
+from bls12_381 import fq
+from structure import AffinePointG1
+from jacobian import ProjectivePointG1
+import parallel
+
+# Approximate cost, in base field multiplications, of adding one point into a
+# bucket (affine addition plus its share of the batch inversion) and of one
+# Jacobian addition in the bucket running sum. Used to choose the window size.
+AFFINE_ADD_COST = 6
+JACOBIAN_ADD_COST = 14
+
+MAX_WINDOW_SIZE = 20
+
+# Given plain integers {v_i}, all nonzero mod `modulus`, compute {v_i^(-1)}
+# with a single inversion (same trick as `serial_batch_inversion_and_mul`).
+def batch_inverse(values, modulus):
+    prod = [None] * len(values)
+    acc = gmpy2.mpz(1)
+    for i, v in enumerate(values):
+        prod[i] = acc
+        acc = acc * v % modulus
+    inv = gmpy2.invert(acc, modulus)
+    res = [None] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        res[i] = inv * prod[i] % modulus
+        inv = inv * values[i] % modulus
+    return res
+
+# Window size `c` minimising the estimated cost of an MSM with `size` points
+# and scalars of `num_bits` bits: every window adds each point into a bucket
+# once, then runs over its 2^(c-1) buckets with two Jacobian additions each.
+def window_size(size, num_bits):
+    best_c = 1
+    best_cost = None
+    for c in range(1, MAX_WINDOW_SIZE + 1):
+        num_windows = num_bits // c + 1
+        cost = num_windows * (size * AFFINE_ADD_COST + (1 << c) * JACOBIAN_ADD_COST)
+        if best_cost is None or cost < best_cost:
+            best_c, best_cost = c, cost
+    return best_c
+
+# Split every scalar into signed digits d_w in [-2^(c-1), 2^(c-1)] with
+# s = sum d_w * 2^(c*w). Returns one list of digits per window.
+def signed_digits(scalars, c, num_windows):
+    mask = (1 << c) - 1
+    half = 1 << (c - 1)
+    full = 1 << c
+    digits = [[0] * len(scalars) for _ in range(num_windows)]
+    for i, s in enumerate(scalars):
+        carry = 0
+        for w in range(num_windows):
+            d = (s & mask) + carry
+            s >>= c
+            if d > half:
+                d -= full
+                carry = 1
+            else:
+                carry = 0
+            digits[w][i] = d
+    return digits
+
+# Sum the affine points of every bucket with batch-affine additions.
+# Each round pairs up the points of all buckets and shares one inversion across
+# the whole round, until every bucket holds at most one point.
+# Points are (x, y) tuples of canonical integers; buckets are updated in place.
+def reduce_buckets(buckets, modulus):
+    m = modulus
+    while True:
+        owners = []
+        lhs = []
+        rhs = []
+        denoms = []
+        for i, bucket in enumerate(buckets):
+            while len(bucket) >= 2:
+                p = bucket.pop()
+                q = bucket.pop()
+                if p[0] != q[0]:
+                    denoms.append((q[0] - p[0]) % m)
+                elif p[1] == q[1] and p[1] != 0:
+                    # Doubling
+                    denoms.append(2 * p[1] % m)
+                else:
+                    # p = -q, the pair cancels out
+                    continue
+                owners.append(i)
+                lhs.append(p)
+                rhs.append(q)
+        if not owners:
+            return buckets
+
+        inverses = batch_inverse(denoms, m)
+        for i, p, q, inv in zip(owners, lhs, rhs, inverses):
+            x1, y1 = p
+            x2, y2 = q
+            if x1 != x2:
+                lam = (y2 - y1) * inv % m
+            else:
+                lam = 3 * x1 * x1 * inv % m
+            x3 = (lam * lam - x1 - x2) % m
+            y3 = (lam * (x1 - x3) - y1) % m
+            buckets[i].append((x3, y3))
+
+# sum((i + 1) * buckets[i]) for reduced buckets (at most one point each),
+# as a running sum in Jacobian coordinates
+def bucket_sum(buckets):
+    zero = ProjectivePointG1.zero(fq.Fq.zero())
+    res = zero
+    running_sum = zero
+    for bucket in reversed(buckets):
+        if bucket:
+            x, y = bucket[0]
+            point = AffinePointG1.new(fq.Fq.from_repr(x), fq.Fq.from_repr(y))
+            running_sum = running_sum.add_assign_mixed(point)
+        res = res.add_assign(running_sum)
+    return res
+
+# Bucket sums of the windows in `digits` (one list of signed digits per window)
+# for the points with canonical coordinates `xs`, `ys` (`neg_ys` = -ys)
+def compute_window_sums(xs, ys, neg_ys, digits, c):
+    m = fq.Fq.MODULUS
+    window_sums = []
+    for window_digits in digits:
+        buckets = [[] for _ in range(1 << (c - 1))]
+        for d, x, y, neg_y in zip(window_digits, xs, ys, neg_ys):
+            if d > 0:
+                buckets[d - 1].append((x, y))
+            elif d < 0:
+                buckets[-d - 1].append((x, neg_y))
+        reduce_buckets(buckets, m)
+        window_sums.append(bucket_sum(buckets))
+    return window_sums
+
+# Pippenger multi-scalar multiplication over signed-digit windows.
+# Scalars are decomposed once up front; within a window each point goes to the
+# bucket of |digit| (negated for negative digits) and buckets are summed in
+# affine form with batched inversions. The bucket sums are then combined with
+# the usual running sum in Jacobian coordinates.
+# `bases` are AffinePointG1, `scalars` plain integers (canonical representation).
+def msm(bases, scalars):
+    m = fq.Fq.MODULUS
+    zero = ProjectivePointG1.zero(fq.Fq.zero())
+
+    xs = []
+    ys = []
+    ks = []
+    for b, s in zip(bases, scalars):
+        if s != 0 and not b.is_zero():
+            xs.append(b.x.into_repr())
+            ys.append(b.y.into_repr())
+            ks.append(s)
+    if not ks:
+        return zero
+
+    num_bits = max(max(k.bit_length() for k in ks), 1)
+    c = window_size(len(ks), num_bits)
+    num_windows = num_bits // c + 1
+    digits = signed_digits(ks, c, num_windows)
+    neg_ys = [(m - y) % m for y in ys]
+
+    # Windows are independent, so blocks of them can go to worker processes
+    jobs = [(xs, ys, neg_ys, digits[windows], c) for windows in parallel.chunk_ranges(num_windows)]
+    window_sums = []
+    for sums in parallel.map_ordered(compute_window_sums, jobs):
+        window_sums.extend(sums)
+
+    total = zero
+    for sum_i in reversed(window_sums):
+        for _ in range(c):
+            total = total.double()
+        total = total.add_assign(sum_i)
+    return total
@@ -0,0 +1,133 @@
+import gmpy2
+from bls12_381 import fr
+
+def reverse_bits(operand, bit_count):
+    acc = 0
+    for i in range(bit_count):
+        acc = (acc << 1) | ((operand >> i) & 1)
+    return acc
+
+# Radix-2 NTT over a fixed domain size.
+# The bit-reversal swaps and the forward/inverse twiddle tables are computed once
+# and shared by every transform of that size. Butterflies run over flat lists of
+# raw field values, with twiddles stored as raw multipliers (see `field.mul_operand`)
+# so each product is a single multiply and reduction.
+class NTTEngine:
+    _cache = {}
+
+    def __init__(self, domain):
+        self.size = domain.size
+        self.log_size = domain.log_size_of_group
+        self.modulus = fr.Fr.MODULUS
+
+        # Pairs (idx, ridx) with idx < ridx that the bit-reversal permutation swaps
+        self.swaps = []
+        for idx in range(1, self.size - 1):
+            ridx = reverse_bits(idx, self.log_size)
+            if idx < ridx:
+                self.swaps.append((idx, ridx))
+
+        self.twiddles = self.precompute_twiddles(domain.group_gen)
+        self.inv_twiddles = self.precompute_twiddles(domain.group_gen_inv)
+        self.size_inv = domain.size_inv.mul_operand()
+        self._coset_powers = {}
+
+    # Returns the engine for `domain`, building it on first use of that size
+    @classmethod
+    def for_domain(cls, domain):
+        engine = cls._cache.get(domain.size)
+        if engine is None:
+            engine = cls(domain)
+            cls._cache[domain.size] = engine
+        return engine
+
+    # Raw multipliers for root^0 .. root^(size/2 - 1)
+    def precompute_twiddles(self, root):
+        m = self.modulus
+        w = root.mul_operand()
+        powers = [gmpy2.mpz(1)] * max(self.size // 2, 1)
+        for idx in range(1, len(powers)):
+            powers[idx] = powers[idx - 1] * w % m
+        return powers
+
+    def butterflies(self, a, twiddles):
+        return self.butterflies_many([a], twiddles)[0]
+
+    # Runs the same transform over several arrays. Each stage walks the twiddles
+    # once and applies every twiddle to all arrays before moving to the next one.
+    def butterflies_many(self, arrays, twiddles):
+        m = self.modulus
+        size = self.size
+        for a in arrays:
+            for i, j in self.swaps:
+                a[i], a[j] = a[j], a[i]
+        half = 1
+        stride = size // 2
+        while half < size:
+            chunk = half * 2
+            for a in arrays:
+                for j in range(0, size, chunk):
+                    x = a[j]
+                    y = a[j + half]
+                    a[j] = (x + y) % m
+                    a[j + half] = (x - y) % m
+            for k in range(1, half):
+                w = twiddles[k * stride]
+                for a in arrays:
+                    for j in range(k, size, chunk):
+                        t = a[j + half] * w % m
+                        x = a[j]
+                        a[j] = (x + t) % m
+                        a[j + half] = (x - t) % m
+            half = chunk
+            stride //= 2
+        return arrays
+
+    # Raw multipliers `c*g^i` for i in 0..size (`c` itself a raw multiplier),
+    # built once per (g, c) and reused by every coset transform over this domain
+    def coset_powers(self, g, c=1):
+        key = (g.value, c)
+        powers = self._coset_powers.get(key)
+        if powers is None:
+            m = self.modulus
+            w = g.mul_operand()
+            powers = [gmpy2.mpz(c)] * self.size
+            for i in range(1, self.size):
+                powers[i] = powers[i - 1] * w % m
+            self._coset_powers[key] = powers
+        return powers
+
+    # Multiply every raw value of `a` with the matching entry of `powers`, in place
+    def distribute_powers(self, a, powers):
+        m = self.modulus
+        a[:] = [x * p % m for x, p in zip(a, powers)]
+        return a
+
+    # Evaluations of the coefficients `a` (raw values, length `size`), in place
+    def ntt(self, a):
+        return self.butterflies(a, self.twiddles)
+
+    # Coefficients of the evaluations `a` (raw values, length `size`), in place
+    def intt(self, a):
+        self.butterflies(a, self.inv_twiddles)
+        m = self.modulus
+        s = self.size_inv
+        a[:] = [x * s % m for x in a]
+        return a
+
+    # Evaluations over the coset `g*H` of the coefficients `a`, in place
+    def coset_ntt(self, a, g):
+        return self.coset_ntt_many([a], g)[0]
+
+    # Coset NTT of several coefficient arrays sharing one coset-power table
+    # and one pass over the twiddles
+    def coset_ntt_many(self, arrays, g):
+        powers = self.coset_powers(g)
+        for a in arrays:
+            self.distribute_powers(a, powers)
+        return self.butterflies_many(arrays, self.twiddles)
+
+    # Coefficients of the evaluations `a` over the coset `g*H`, given `g_inv`, in place
+    def coset_intt(self, a, g_inv):
+        self.butterflies(a, self.inv_twiddles)
+        return self.distribute_powers(a, self.coset_powers(g_inv, self.size_inv))
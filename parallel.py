@@ -0,0 +1,72 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Number of worker processes used by the parallel prover stages.
+# 1 keeps all work in the calling process. Read from PLONK_WORKERS at import,
+# can be changed later with `set_workers`.
+WORKERS = int(os.environ.get("PLONK_WORKERS", "1"))
+
+_pools = {}
+
+# Set in pool processes, so that work submitted from inside a worker runs
+# serially there instead of starting nested pools
+_in_worker = False
+
+def _mark_worker():
+    global _in_worker
+    _in_worker = True
+
+def set_workers(n):
+    global WORKERS
+    WORKERS = max(1, int(n))
+
+def workers():
+    return 1 if _in_worker else WORKERS
+
+# Returns a process pool with `n` workers, created on first use and kept for reuse
+def get_pool(n):
+    pool = _pools.get(n)
+    if pool is None:
+        pool = ProcessPoolExecutor(max_workers=n, initializer=_mark_worker)
+        _pools[n] = pool
+    return pool
+
+def _init_worker(initializer, initargs):
+    _mark_worker()
+    initializer(*initargs)
+
+# Returns a new pool whose workers run `initializer(*initargs)` once at start.
+# Meant for state every job needs, which is then pickled once per worker
+# instead of once per job. The caller shuts the pool down.
+def new_pool(n, initializer, initargs):
+    return ProcessPoolExecutor(max_workers=n, initializer=_init_worker,
+                               initargs=(initializer, initargs))
+
+def shutdown():
+    for pool in _pools.values():
+        pool.shutdown()
+    _pools.clear()
+
+# Split range(size) into at most `parts` contiguous slices of near-equal length
+def chunk_ranges(size, parts=None):
+    parts = workers() if parts is None else parts
+    parts = max(1, min(parts, size))
+    step, extra = divmod(size, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        end = start + step + (1 if i < extra else 0)
+        ranges.append(slice(start, end))
+        start = end
+    return ranges
+
+# Calls `fn(*args)` for every tuple in `jobs` and returns the results in order.
+# The calls run in worker processes when more than one worker is configured,
+# so `fn` and its arguments must be picklable.
+def map_ordered(fn, jobs, n=None):
+    n = workers() if n is None else n
+    if n <= 1 or len(jobs) <= 1:
+        return [fn(*args) for args in jobs]
+    pool = get_pool(n)
+    futures = [pool.submit(fn, *args) for args in jobs]
+    return [f.result() for f in futures]
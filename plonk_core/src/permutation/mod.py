@@ -1,8 +1,8 @@
 from plonk_core.src.permutation import constants
-from arithmetic import NTT,INTT,from_coeff_vec
+from arithmetic import NTT,INTT,from_coeff_vec,batch_inversion
 from bls12_381 import fr
+from field_vector import FieldVector
 import copy
-import math
 
 def numerator_irreducible(root, w, k, beta, gamma):
     mid1 = beta.mul(k)
@@ -17,109 +17,82 @@ def denominator_irreducible(w, sigma, beta, gamma):
     mid3 = mid2.add(gamma)
     return mid3
 
-def lookup_ratio(delta, epsilon, f, t, t_next,
+# Numerator and denominator of the lookup grand product ratio for one row,
+# or for every row when f, t, t_next, h_1, h_1_next and h_2 are FieldVectors
+def lookup_ratio_terms(delta, epsilon, f, t, t_next,
                 h_1, h_1_next, h_2):
     one = delta.one()
     one_plus_delta =delta.add(one)
     epsilon_one_plus_delta = epsilon.mul(one_plus_delta)
 
-    mid1 = epsilon.add(f)
-    mid2 = epsilon_one_plus_delta.add(t)
-    mid3 = delta.mul(t_next)
+    mid1 = f.add(epsilon)
+    mid2 = t.add(epsilon_one_plus_delta)
+    mid3 = t_next.mul(delta)
     mid4 = mid2.add(mid3)
-    mid5 = one_plus_delta.mul(mid1)
-    result = mid5.mul(mid4)
+    mid5 = mid1.mul(one_plus_delta)
+    numerator = mid5.mul(mid4)
 
     mid6 = h_2.mul(delta)
-    mid7 = epsilon_one_plus_delta.add(h_1)
+    mid7 = h_1.add(epsilon_one_plus_delta)
     mid8 = mid7.add(mid6)
-    mid9 = epsilon_one_plus_delta.add(h_2)
+    mid9 = h_2.add(epsilon_one_plus_delta)
     mid10 = h_1_next.mul(delta)
     mid11 = mid9.add(mid10)
-    mid12 = mid8.mul(mid11)
-    mid12 = fr.Fr.inverse(mid12)
-    result = result.mul(mid12)
+    denominator = mid8.mul(mid11)
 
+    return numerator, denominator
 
+def lookup_ratio(delta, epsilon, f, t, t_next,
+                h_1, h_1_next, h_2):
+    numerator, denominator = lookup_ratio_terms(delta, epsilon, f, t, t_next,
+                                                h_1, h_1_next, h_2)
+    result = numerator.mul(fr.Fr.inverse(denominator))
     return result
 
 
-def compute_permutation_poly(domain, wires, beta, gamma, sigma_polys):
+# `sigma_mappings` may hold the evaluations of the sigma polynomials over
+# `domain` when they are already known (see `Permutation.sigma_evaluations`);
+# they are computed from `sigma_polys` otherwise.
+def compute_permutation_poly(domain, wires, beta, gamma, sigma_polys, sigma_mappings=None):
     n = domain.size
 
     # Constants defining cosets H, k1H, k2H, etc
     ks = [beta.one(),constants.K1(),constants.K2(),constants.K3()]
-    sigma_mappings = [[],[],[],[]]
-
-    sigma_mappings[0] = NTT(domain,sigma_polys[0])
-    sigma_mappings[1] = NTT(domain,sigma_polys[1])
-    sigma_mappings[2] = NTT(domain,sigma_polys[2])
-    sigma_mappings[3] = NTT(domain,sigma_polys[3])
-
-    # Transpose wires and sigma values to get "rows" in the form [wl_i,
-    # wr_i, wo_i, ... ] where each row contains the wire and sigma
-    # values for a single gate
-    gatewise_wires = [
-        [w0, w1, w2, w3] for w0, w1, w2, w3 in zip(wires[0],wires[1],wires[2],wires[3])
-    ]
-    gatewise_sigmas = [
-        [s0, s1, s2, s3] for s0, s1, s2, s3 in zip(sigma_mappings[0],sigma_mappings[1],
-                                                   sigma_mappings[2],sigma_mappings[3])
-    ]
-
-    # Compute all roots, same as calculating twiddles, but doubled in size
-    log_size = int(math.log2(n))
-    roots = [fr.Fr.zero() for _ in range(1 << log_size )]
-    roots[0] = beta.one()
-    for idx in range(1, len(roots)):
-        roots[idx] = roots[idx - 1].mul(domain.group_gen)
-    
-    # Initialize an empty list for product_argument
-    product_argument = []
-
-    # Associate each wire value in a gate with the k defining its coset
-    for gate_root, gate_sigmas, gate_wires in zip(roots, gatewise_sigmas, gatewise_wires):
-        # Initialize numerator and denominator products
-        numerator_product = beta.one()
-        denominator_product = beta.one()
-
-        # Now the ith element represents gate i and will have the form:
-        # (root_i, ((w0_i, s0_i, k0), (w1_i, s1_i, k1), ..., (wm_i, sm_i,
-        # km)))   for m different wires, which is all the
-        # information   needed for a single product coefficient
-        # for a single gate Multiply up the numerator and
-        # denominator irreducibles for each gate and pair the results
-        for sigma, wire, k in zip(gate_sigmas, gate_wires, ks):
-
-            # Calculate numerator and denominator for each wire
-            numerator_temp = numerator_irreducible(gate_root, wire, k, beta, gamma)
-            numerator_product= numerator_product.mul(numerator_temp)
-            denominator_temp = denominator_irreducible(wire, sigma, beta, gamma)
+    if sigma_mappings is None:
+        sigma_mappings = [NTT(domain,sigma_poly) for sigma_poly in sigma_polys]
+
+    # Every factor is computed over the whole domain at once: for wire j the
+    # numerator irreducible is w_j + beta * k_j * root + gamma and the
+    # denominator irreducible is w_j + beta * sigma_j + gamma
+    wires = [FieldVector.from_list(w, fr.Fr) for w in wires]
+    sigma_mappings = [FieldVector.from_list(sigma, fr.Fr) for sigma in sigma_mappings]
+
+    # All roots of the domain, cached per domain size
+    roots = FieldVector.from_list(domain.elements(), fr.Fr)
+
+    numerator_product = None
+    denominator_product = None
+    for sigma, wire, k in zip(sigma_mappings, wires, ks):
+        numerator_temp = wire.add_many([roots.scale(beta.mul(k)), gamma])
+        denominator_temp = wire.add_many([sigma.scale(beta), gamma])
+        if numerator_product is None:
+            numerator_product, denominator_product = numerator_temp, denominator_temp
+        else:
+            numerator_product = numerator_product.mul(numerator_temp)
             denominator_product = denominator_product.mul(denominator_temp)
-        
-        # Calculate the product coefficient for the gate
-        denominator_product_under = fr.Fr.inverse(denominator_product)
-        gate_coefficient = numerator_product.mul(denominator_product_under)
-        
-        # Append the gate coefficient to the product_argument list
-        product_argument.append(gate_coefficient)
-
-    z=[]
-    # First element is one
-    state = beta.one()
-    z.append(state)
-
-    # Accumulate by successively multiplying the scalars        
-    for s in product_argument:
-        state = state.mul(s)
-        z.append(state)
-
-    # Remove the last(n+1'th) element
-    z.pop()
-    
+
+    # Invert all gate denominators with a single inversion, then calculate
+    # the product coefficient of every gate
+    batch_inversion(denominator_product)
+    product_argument = numerator_product.mul(denominator_product)
+
+    # z starts at one and accumulates the product coefficients; the last
+    # (n+1'th) product is dropped
+    z = product_argument.prefix_products()
+
     #Compute z poly
     z_poly = INTT(domain,z)
-    z_poly = from_coeff_vec(z_poly)
+    z_poly = from_coeff_vec(z_poly.to_list())
     
     return z_poly
 
@@ -134,23 +107,21 @@ def compute_lookup_permutation_poly(domain, f, t, h_1, h_2, delta, epsilon):
     assert len(h_1) == n
     assert len(h_2) == n
 
-    t_next = t[1:] + [t[0]]
-    h_1_next = h_1[1:] + [h_1[0]]
+    f = FieldVector.from_list(f, fr.Fr)
+    t = FieldVector.from_list(t, fr.Fr)
+    h_1 = FieldVector.from_list(h_1, fr.Fr)
+    h_2 = FieldVector.from_list(h_2, fr.Fr)
 
-    product_arguments = []
-    for f_val, t_val, t_next_val, h_1_val, h_1_next_val, h_2_val in zip(f, t, t_next, h_1, h_1_next, h_2):
-        portion = lookup_ratio(delta, epsilon, f_val, t_val, t_next_val, h_1_val, h_1_next_val, h_2_val)
-        product_arguments.append(portion)
+    # Numerators and denominators of every row at once
+    numerators, denominators = lookup_ratio_terms(delta, epsilon, f, t, t.shift(1),
+                                                  h_1, h_1.shift(1), h_2)
 
-    state = delta.one()
-    p = [state]
-    for s in product_arguments:
-        state = state.mul(s)
-        p.append(state)
-    
-    p.pop()
+    # One inversion for all rows
+    batch_inversion(denominators)
+    product_arguments = numerators.mul(denominators)
+
+    p = product_arguments.prefix_products()
     p_poly = INTT(domain,p)
-    p_poly = from_coeff_vec(p_poly)
+    p_poly = from_coeff_vec(p_poly.to_list())
     
     return p_poly
-
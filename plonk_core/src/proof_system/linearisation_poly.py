@@ -9,7 +9,7 @@ from plonk_core.src.proof_system.widget.range import RangeGate,RangeValues
 from plonk_core.src.proof_system.widget.logic import LogicGate,LogicValues
 from plonk_core.src.proof_system.widget.fixed_base_scalar_mul import FBSMGate,FBSMValues
 from plonk_core.src.proof_system.widget.curve_addition import CAGate,CAValues
-from arithmetic import poly_mul_const,poly_add_poly,evaluate,compute_first_lagrange_evaluation
+from arithmetic import poly_mul_const,poly_add_poly,evaluate_many,evaluate_lagrange_many,compute_first_lagrange_evaluation
 
 
 @dataclass
@@ -115,26 +115,69 @@ def compute(
     f_poly: List[fr.Fr],
     h1_poly: List[fr.Fr],
     h2_poly: List[fr.Fr],
-    table_poly: List[fr.Fr]
+    table_poly: List[fr.Fr],
+    w_scalars
     ):
     n = domain.size
     omega = domain.group_gen
     shifted_z_challenge = z_challenge.mul(omega)
 
-    # Wire evaluations
-    a_eval = evaluate(w_l_poly, z_challenge)
-    b_eval = evaluate(w_r_poly, z_challenge)
-    c_eval = evaluate(w_o_poly, z_challenge)
-    d_eval = evaluate(w_4_poly, z_challenge)
+    # The wires (from the witness scalars) and the sigma polynomials (cached
+    # on the prover key) are known over the domain, so they are evaluated
+    # from the Lagrange coefficients at `z_challenge`
+    (
+        (a_eval, a_next_eval),
+        (b_eval, b_next_eval),
+        (c_eval, _),
+        (d_eval, d_next_eval),
+        (left_sigma_eval, _),
+        (right_sigma_eval, _),
+        (out_sigma_eval, _),
+    ) = evaluate_lagrange_many(
+        domain,
+        list(w_scalars) + prover_key.permutation.sigma_evaluations(domain)[:3],
+        z_challenge)
+
+    # Every other opened polynomial is evaluated at `z_challenge` and
+    # `shifted_z_challenge` in one batched pass
+    (
+        (_, permutation_eval),
+        (q_arith_eval, _),
+        (q_lookup_eval, _),
+        (q_c_eval, _),
+        (q_l_eval, _),
+        (q_r_eval, _),
+        (q_hl_eval, _),
+        (q_hr_eval, _),
+        (q_h4_eval, _),
+        (_, z2_next_eval),
+        (h1_eval, h1_next_eval),
+        (h2_eval, _),
+        (f_eval, _),
+        (table_eval, table_next_eval),
+    ) = evaluate_many(
+        [
+            z_poly,
+            prover_key.arithmetic.q_arith[0],
+            prover_key.lookup.q_lookup[0],
+            prover_key.arithmetic.q_c[0],
+            prover_key.arithmetic.q_l[0],
+            prover_key.arithmetic.q_r[0],
+            prover_key.arithmetic.q_hl[0],
+            prover_key.arithmetic.q_hr[0],
+            prover_key.arithmetic.q_h4[0],
+            z2_poly,
+            h1_poly,
+            h2_poly,
+            f_poly,
+            table_poly,
+        ],
+        [z_challenge, shifted_z_challenge])
 
+    # Wire evaluations
     wire_evals = WireEvaluations(a_eval,b_eval,c_eval,d_eval)
 
     # Permutation evaluations
-    left_sigma_eval = evaluate(prover_key.permutation.left_sigma[0], z_challenge)
-    right_sigma_eval = evaluate(prover_key.permutation.right_sigma[0], z_challenge)
-    out_sigma_eval = evaluate(prover_key.permutation.out_sigma[0], z_challenge)
-    permutation_eval = evaluate(z_poly, shifted_z_challenge)
-
     perm_evals = PermutationEvaluations(
         left_sigma_eval,
         right_sigma_eval,
@@ -142,25 +185,7 @@ def compute(
         permutation_eval
     )
 
-    # Arith selector evaluation
-    q_arith_eval = evaluate(prover_key.arithmetic.q_arith[0], z_challenge)
-
-    # Lookup selector evaluation
-    q_lookup_eval = evaluate(prover_key.lookup.q_lookup[0], z_challenge)
-
     # Custom gate evaluations
-    q_c_eval = evaluate(prover_key.arithmetic.q_c[0], z_challenge)
-    q_l_eval = evaluate(prover_key.arithmetic.q_l[0], z_challenge)
-    q_r_eval = evaluate(prover_key.arithmetic.q_r[0], z_challenge)
-    a_next_eval = evaluate(w_l_poly, shifted_z_challenge)
-    b_next_eval = evaluate(w_r_poly, shifted_z_challenge)
-    d_next_eval = evaluate(w_4_poly, shifted_z_challenge)
-
-    # High degree selector evaluations
-    q_hl_eval = evaluate(prover_key.arithmetic.q_hl[0], z_challenge)
-    q_hr_eval = evaluate(prover_key.arithmetic.q_hr[0], z_challenge)
-    q_h4_eval = evaluate(prover_key.arithmetic.q_h4[0], z_challenge)
-
     custom_evals = CustomEvaluations(
         [("q_arith_eval", q_arith_eval),
          ("q_c_eval", q_c_eval),
@@ -174,14 +199,6 @@ def compute(
          ("d_next_eval", d_next_eval)]
     )
 
-    z2_next_eval = evaluate(z2_poly, shifted_z_challenge)
-    h1_eval = evaluate(h1_poly, z_challenge)
-    h1_next_eval = evaluate(h1_poly, shifted_z_challenge)
-    h2_eval = evaluate(h2_poly, z_challenge)
-    f_eval = evaluate(f_poly, z_challenge)
-    table_eval = evaluate(table_poly, z_challenge)
-    table_next_eval = evaluate(table_poly, shifted_z_challenge)
-
     # Compute the last term in the linearisation polynomial (negative_quotient_term):
     # - Z_h(z_challenge) * [t_1(X) + z_challenge^n * t_2(X) + z_challenge^2n *
     # t_3(X) + z_challenge^3n * t_4(X)]
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from bls12_381 import fr
 from typing import List, Tuple
 from domain import Radix2EvaluationDomain
-from arithmetic import poly_mul_const,poly_add_poly
+from arithmetic import NTT,poly_mul_const,poly_add_poly
 from plonk_core.src.permutation.constants import K1,K2,K3
 @dataclass
 class Permutation:
@@ -21,6 +21,19 @@ class Permutation:
     # Linear Evaluations
     linear_evaluations: List[fr.Fr]
 
+    # Evaluations of the four sigma polynomials over the n-size `domain`.
+    # They depend on the prover key alone, so they are computed on first use
+    # and kept as a third member of each sigma tuple (a binary prover key
+    # stores them too, see `prover_key_file.convert_prover_key`).
+    def sigma_evaluations(self, domain: Radix2EvaluationDomain):
+        sigmas = [self.left_sigma, self.right_sigma, self.out_sigma, self.fourth_sigma]
+        if any(len(sigma) < 3 or len(sigma[2]) != domain.size for sigma in sigmas):
+            sigmas = [(sigma[0], sigma[1], NTT(domain, sigma[0])) for sigma in sigmas]
+            self.left_sigma, self.right_sigma, self.out_sigma, self.fourth_sigma = sigmas
+        return [sigma[2] for sigma in sigmas]
+
+    # Computes the permutation contribution to the quotient polynomial at
+    # `index`, or over a slice of rows when the inputs are FieldVectors.
     def compute_quotient_i(self, index,
         w_l_i: fr.Fr, w_r_i: fr.Fr, w_o_i: fr.Fr, w_4_i: fr.Fr,
         z_i: fr.Fr, z_i_next: fr.Fr,
@@ -53,22 +66,22 @@ class Permutation:
         k2 = K2()
         k3 = K3()
         
-        mid1_1 = beta.mul(x)
+        mid1_1 = x.mul(beta)
         mid1_2 = w_l_i.add(mid1_1)
         mid1 = mid1_2.add(gamma)
 
         mid2_1_1 = beta.mul(k1)
-        mid2_1 = mid2_1_1.mul(x)
+        mid2_1 = x.mul(mid2_1_1)
         mid2_2 = w_r_i.add(mid2_1)
         mid2 = mid2_2.add(gamma)
 
         mid3_1_1 = beta.mul(k2)
-        mid3_1 = mid3_1_1.mul(x)
+        mid3_1 = x.mul(mid3_1_1)
         mid3_2 = w_o_i.add(mid3_1)
         mid3 = mid3_2.add(gamma)
 
         mid4_1_1 = beta.mul(k3)
-        mid4_1 = mid4_1_1.mul(x)
+        mid4_1 = x.mul(mid4_1_1)
         mid4_2 = w_4_i.add(mid4_1)
         mid4 = mid4_2.add(gamma)
 
@@ -99,19 +112,19 @@ class Permutation:
         out_sigma_eval = self.out_sigma[1][index]
         fourth_sigma_eval = self.fourth_sigma[1][index]
 
-        mid1_1 = beta.mul(left_sigma_eval)
+        mid1_1 = left_sigma_eval.mul(beta)
         mid1_2 = w_l_i.add(mid1_1)
         mid1 = mid1_2.add(gamma)
 
-        mid2_1 = beta.mul(right_sigma_eval)
+        mid2_1 = right_sigma_eval.mul(beta)
         mid2_2 = w_r_i.add(mid2_1)
         mid2 = mid2_2.add(gamma)
         
-        mid3_1 = beta.mul(out_sigma_eval)
+        mid3_1 = out_sigma_eval.mul(beta)
         mid3_2 = w_o_i.add(mid3_1)
         mid3 = mid3_2.add(gamma)
 
-        mid4_1 = beta.mul(fourth_sigma_eval)
+        mid4_1 = fourth_sigma_eval.mul(beta)
         mid4_2 = w_4_i.add(mid4_1)
         mid4 = mid4_2.add(gamma)
 
@@ -251,8 +264,7 @@ class Permutation:
         alpha_sq: fr.Fr, 
         z_coeffs: List[fr.Fr]):
 
-        lagrange_coefficients = domain.evaluate_all_lagrange_coefficients(z_challenge)
-        l_1_z = lagrange_coefficients[0]
+        l_1_z = fr.Fr.from_repr(domain.lagrange_coefficients(z_challenge)[0])
         const = l_1_z.mul(alpha_sq)
         res = poly_mul_const(z_coeffs,const)
         return res
@@ -4,6 +4,14 @@ from typing import List, Tuple
 from plonk_core.src.proof_system.widget.arithmetic import Arith
 from plonk_core.src.proof_system.widget.lookup import Lookup
 from plonk_core.src.proof_system.permutation import Permutation
+from arithmetic import batch_inversion
+from field_vector import FieldVector
+from bls12_381 import fr
+# Polynomials whose commitments are kept in `Prover_Key.fixed_commitments`:
+# the four sigma polynomials and the interpolated lookup table columns
+FIXED_COMMITMENTS = ["left_sigma", "right_sigma", "out_sigma", "fourth_sigma",
+                     "table_1", "table_2", "table_3", "table_4"]
+
 @dataclass 
 class Prover_Key:
     arithmetic: Arith
@@ -20,4 +28,32 @@ class Prover_Key:
 
     permutation: Permutation
 
-    v_h_coset_8n: List[field]
\ No newline at end of file
+    v_h_coset_8n: List[field]
+
+    # Inverses of the first `size` entries of `v_h_coset_8n`, see `v_h_coset_8n_inverse`
+    v_h_coset_8n_inv: FieldVector = None
+
+    # Commitments (affine G1 points) to the polynomials fixed by the key, in
+    # the order of `FIXED_COMMITMENTS`; computed on first use with the SRS
+    # the key is proved with (see `gen_proof.fixed_commitments`)
+    fixed_commitments: list = None
+
+    # The first two powers of g of the SRS `fixed_commitments` were computed
+    # with; the commitments are only valid for that SRS
+    fixed_commitments_srs: list = None
+
+    # Inverses of the vanishing polynomial over the first `size` points of the
+    # 8n coset, so the quotient division is a vector multiply. Z_H takes only
+    # a few distinct values there (8 for the 8n coset); those are batch
+    # inverted and the result is kept on the key.
+    def v_h_coset_8n_inverse(self, size):
+        if self.v_h_coset_8n_inv is None or len(self.v_h_coset_8n_inv) != size:
+            evals = FieldVector.from_list(self.v_h_coset_8n[:size], fr.Fr)
+            first_index = {}
+            for i, v in enumerate(evals.values):
+                first_index.setdefault(v, i)
+            distinct = [evals[i] for i in first_index.values()]
+            batch_inversion(distinct)
+            inverse_of = dict(zip(first_index, FieldVector.from_list(distinct, fr.Fr).values))
+            self.v_h_coset_8n_inv = FieldVector([inverse_of[v] for v in evals.values], fr.Fr)
+        return self.v_h_coset_8n_inv
\ No newline at end of file
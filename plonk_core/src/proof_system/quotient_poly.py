@@ -1,13 +1,17 @@
 from domain import Radix2EvaluationDomain
 import gmpy2
 from bls12_381 import fr
-from arithmetic import INTT,coset_NTT,coset_INTT,from_coeff_vec
+from arithmetic import INTT,coset_NTT,coset_NTT_many,coset_INTT,from_coeff_vec
 from plonk_core.src.proof_system.widget.mod import WitnessValues
 from plonk_core.src.proof_system.widget.range import RangeGate,RangeValues
 from plonk_core.src.proof_system.widget.logic import LogicGate,LogicValues
 from plonk_core.src.proof_system.widget.fixed_base_scalar_mul import FBSMGate,FBSMValues
 from plonk_core.src.proof_system.widget.curve_addition import CAGate,CAValues
 from plonk_core.src.proof_system.mod import CustomEvaluations
+from plonk_core.src.proof_system.widget.mod import restrict_rows
+from plonk_core.src.proof_system.permutation import Permutation
+from field_vector import FieldVector
+import parallel
 
 # Computes the first lagrange polynomial with the given `scale` over `domain`.
 def compute_first_lagrange_poly_scaled(domain: Radix2EvaluationDomain,scale: fr.Fr):
@@ -17,115 +21,143 @@ def compute_first_lagrange_poly_scaled(domain: Radix2EvaluationDomain,scale: fr.
     result_poly = from_coeff_vec(x_coeffs)
     return result_poly
 
+# Gate constraint contributions for one contiguous block of rows of the 8n domain.
+# Every argument only covers those rows (`next_vals` holds the rows 8 ahead),
+# so the block can be computed in a worker process.
+def compute_gate_constraint_rows(arithmetic, selectors, challenges,
+                                 wit, next_vals, pi_eval):
+    range_challenge, logic_challenge, fixed_base_challenge, var_base_challenge = challenges
+    range_selector, logic_selector, fixed_group_add_selector, variable_group_add_selector = selectors
+    rows = slice(0, len(pi_eval))
+
+    wit_vals = WitnessValues(
+        a_val=wit[0],
+        b_val=wit[1],
+        c_val=wit[2],
+        d_val=wit[3]
+    )
+
+    custom_vals = CustomEvaluations(
+        vals=[
+            ("a_next_eval", next_vals[0]),
+            ("b_next_eval", next_vals[1]),
+            ("d_next_eval", next_vals[2]),
+            ("q_l_eval", arithmetic.q_l[1][rows]),
+            ("q_r_eval", arithmetic.q_r[1][rows]),
+            ("q_c_eval", arithmetic.q_c[1][rows]),
+            # Possibly unnecessary but included nonetheless...
+            ("q_hl_eval", arithmetic.q_hl[1][rows]),
+            ("q_hr_eval", arithmetic.q_hr[1][rows]),
+            ("q_h4_eval", arithmetic.q_hr[1][rows])
+        ]
+    )
+
+    arithmetic_term = arithmetic.compute_quotient_i(rows, wit_vals)
+    range_term = RangeGate.quotient_term(
+        range_selector,
+        range_challenge,
+        wit_vals,
+        custom_vals = RangeValues.from_evaluations(custom_vals)
+    )
+    logic_term = LogicGate.quotient_term(
+        logic_selector,
+        logic_challenge,
+        wit_vals,
+        LogicValues.from_evaluations(custom_vals)
+    )
+    fixed_base_scalar_mul_term = FBSMGate.quotient_term(
+        fixed_group_add_selector,
+        fixed_base_challenge,
+        wit_vals,
+        FBSMValues.from_evaluations(custom_vals)
+    )
+    curve_addition_term = CAGate.quotient_term(
+        variable_group_add_selector,
+        var_base_challenge,
+        wit_vals,
+        CAValues.from_evaluations(custom_vals)
+    )
+
+    gate_contributions = arithmetic_term.add_many([pi_eval, range_term, logic_term,
+                                                   fixed_base_scalar_mul_term, curve_addition_term])
+    return gate_contributions
+
 def compute_gate_constraint_satisfiability(domain, 
     range_challenge, logic_challenge, fixed_base_challenge,
     var_base_challenge, prover_key, wl_eval_8n, wr_eval_8n, 
-    wo_eval_8n, w4_eval_8n, pi_poly):
-
-    #get Fr
-    params = fr.Fr(gmpy2.mpz(0))
-    domain_8n = Radix2EvaluationDomain.new(8 * domain.size,params)
-
-    pi_eval_8n = coset_NTT(pi_poly,domain_8n)
-
-    gate_contributions = []
-
-    for i in range(domain_8n.size):
-        wit_vals = WitnessValues(
-            a_val=wl_eval_8n[i],
-            b_val=wr_eval_8n[i],
-            c_val=wo_eval_8n[i],
-            d_val=w4_eval_8n[i]
-        )
-
-        custom_vals = CustomEvaluations(
-            vals=[
-                ("a_next_eval", wl_eval_8n[i + 8]),
-                ("b_next_eval", wr_eval_8n[i + 8]),
-                ("d_next_eval", w4_eval_8n[i + 8]),
-                ("q_l_eval", prover_key.arithmetic.q_l[1][i]),
-                ("q_r_eval", prover_key.arithmetic.q_r[1][i]),
-                ("q_c_eval", prover_key.arithmetic.q_c[1][i]),
-                # Possibly unnecessary but included nonetheless...
-                ("q_hl_eval", prover_key.arithmetic.q_hl[1][i]),
-                ("q_hr_eval", prover_key.arithmetic.q_hr[1][i]),
-                ("q_h4_eval", prover_key.arithmetic.q_hr[1][i])
-            ]
-        )
-
-        arithmetic = prover_key.arithmetic.compute_quotient_i(i, wit_vals)
-        range_term = RangeGate.quotient_term(
-            prover_key.range_selector[1][i],
-            range_challenge,
-            wit_vals,
-            custom_vals = RangeValues.from_evaluations(custom_vals)
-        )
-        logic_term = LogicGate.quotient_term(
-            prover_key.logic_selector[1][i],
-            logic_challenge,
-            wit_vals,
-            LogicValues.from_evaluations(custom_vals)
-        )
-        fixed_base_scalar_mul_term = FBSMGate.quotient_term(
-            prover_key.fixed_group_add_selector[1][i],
-            fixed_base_challenge,
-            wit_vals,
-            FBSMValues.from_evaluations(custom_vals)
-        )
-        curve_addition_term = CAGate.quotient_term(
-            prover_key.variable_group_add_selector[1][i],
-            var_base_challenge,
-            wit_vals,
-            CAValues.from_evaluations(custom_vals)
-        )
-
-        mid1 = arithmetic.add(pi_eval_8n[i])
-        mid2 = mid1.add(range_term)
-        mid3 = mid2.add(logic_term)
-        mid4 = mid3.add(fixed_base_scalar_mul_term)
-        gate_i = mid4.add(curve_addition_term)
-        gate_contributions.append(gate_i)
-
-    return gate_contributions
+    wo_eval_8n, w4_eval_8n, pi_poly, domain_8n=None):
+
+    if domain_8n is None:
+        #get Fr
+        params = fr.Fr(gmpy2.mpz(0))
+        domain_8n = Radix2EvaluationDomain.new(8 * domain.size,params)
+
+    pi_eval_8n = coset_NTT(FieldVector.from_list(pi_poly, fr.Fr),domain_8n)
+
+    wit = [wl_eval_8n, wr_eval_8n, wo_eval_8n, w4_eval_8n]
+    next_vals = [wl_eval_8n.shift(8), wr_eval_8n.shift(8), w4_eval_8n.shift(8)]
+    selectors = [prover_key.range_selector, prover_key.logic_selector,
+                 prover_key.fixed_group_add_selector, prover_key.variable_group_add_selector]
+    challenges = (range_challenge, logic_challenge, fixed_base_challenge, var_base_challenge)
+
+    # Split the rows into contiguous blocks, one per worker
+    jobs = []
+    for rows in parallel.chunk_ranges(domain_8n.size):
+        jobs.append((
+            restrict_rows(prover_key.arithmetic, rows),
+            [s[1][rows] for s in selectors],
+            challenges,
+            [w[rows] for w in wit],
+            [w[rows] for w in next_vals],
+            pi_eval_8n[rows]))
+    blocks = parallel.map_ordered(compute_gate_constraint_rows, jobs)
+
+    return FieldVector.concat(blocks)
 
 def compute_permutation_checks(
     domain:Radix2EvaluationDomain,
     prover_key,
-    wl_eval_8n: list[fr.Fr], wr_eval_8n: list[fr.Fr],
-    wo_eval_8n: list[fr.Fr], w4_eval_8n: list[fr.Fr],
-    z_eval_8n: list[fr.Fr], alpha: fr.Fr, beta: fr.Fr, gamma: fr.Fr):
+    wl_eval_8n: FieldVector, wr_eval_8n: FieldVector,
+    wo_eval_8n: FieldVector, w4_eval_8n: FieldVector,
+    z_eval_8n: FieldVector, alpha: fr.Fr, beta: fr.Fr, gamma: fr.Fr,
+    domain_8n=None, l1_eval_8n=None):
 
-    #get Fr
-    params = fr.Fr(gmpy2.mpz(0))
-    #get NTT domain
-    domain_8n:Radix2EvaluationDomain = Radix2EvaluationDomain.new(8 * domain.size,params)
+    if domain_8n is None:
+        #get Fr
+        params = fr.Fr(gmpy2.mpz(0))
+        #get NTT domain
+        domain_8n = Radix2EvaluationDomain.new(8 * domain.size,params)
 
     # Calculate l1_poly_alpha and l1_alpha_sq_evals
     alpha2 = alpha.square()
-    l1_poly_alpha = compute_first_lagrange_poly_scaled(domain, alpha2)
-    l1_alpha_sq_evals = coset_NTT(l1_poly_alpha, domain_8n)
-
-    # Initialize result list
-    result = []
-
-    # Calculate permutation contribution for each index
-    for i in range(domain_8n.size):
-        quotient_i = prover_key.permutation.compute_quotient_i(
-            i,
-            wl_eval_8n[i],
-            wr_eval_8n[i],
-            wo_eval_8n[i],
-            w4_eval_8n[i],
-            z_eval_8n[i],
-            z_eval_8n[i + 8],
+    if l1_eval_8n is None:
+        l1_poly_alpha = compute_first_lagrange_poly_scaled(domain, alpha2)
+        l1_alpha_sq_evals = coset_NTT(FieldVector.from_list(l1_poly_alpha, fr.Fr), domain_8n)
+    else:
+        # The NTTs are linear, so scaling the unscaled evaluations is enough
+        l1_alpha_sq_evals = l1_eval_8n.scale(alpha2)
+
+    z_next_eval_8n = z_eval_8n.shift(8)
+
+    # Calculate permutation contribution block by block
+    jobs = []
+    for rows in parallel.chunk_ranges(domain_8n.size):
+        jobs.append((
+            restrict_rows(prover_key.permutation, rows),
+            slice(0, rows.stop - rows.start),
+            wl_eval_8n[rows],
+            wr_eval_8n[rows],
+            wo_eval_8n[rows],
+            w4_eval_8n[rows],
+            z_eval_8n[rows],
+            z_next_eval_8n[rows],
             alpha,
-            l1_alpha_sq_evals[i],
+            l1_alpha_sq_evals[rows],
             beta,
-            gamma
-        )
-        result.append(quotient_i)
+            gamma))
+    blocks = parallel.map_ordered(Permutation.compute_quotient_i, jobs)
 
-    return result
+    return FieldVector.concat(blocks)
 
 def compute(domain: Radix2EvaluationDomain, 
             prover_key, 
@@ -136,42 +168,25 @@ def compute(domain: Radix2EvaluationDomain,
             alpha: fr.Fr, beta, gamma, delta, epsilon, zeta, 
             range_challenge, logic_challenge, 
             fixed_base_challenge, var_base_challenge, 
-            lookup_challenge):
+            lookup_challenge,
+            domain_8n=None, l1_eval_8n=None):
     
-    #get Fr
-    params = fr.Fr(gmpy2.mpz(0))
-    #get NTT domain
-    domain_8n = Radix2EvaluationDomain.new(8 * domain.size,params)
-    
-    l1_poly = compute_first_lagrange_poly_scaled(domain, alpha.one())
-    l1_eval_8n = coset_NTT(l1_poly,domain_8n)
-
-    z_eval_8n = coset_NTT(z_poly,domain_8n)
-    z_eval_8n += z_eval_8n[:8]
-
-    wl_eval_8n = coset_NTT(w_l_poly,domain_8n)
-    wl_eval_8n += wl_eval_8n[:8]
-
-    wr_eval_8n = coset_NTT(w_r_poly,domain_8n)
-    wr_eval_8n += wr_eval_8n[:8]
-
-    wo_eval_8n = coset_NTT(w_o_poly,domain_8n)
-
-    w4_eval_8n = coset_NTT(w_4_poly,domain_8n)
-    w4_eval_8n += w4_eval_8n[:8]
-
-    z2_eval_8n = coset_NTT(z2_poly,domain_8n)
-    z2_eval_8n +=z2_eval_8n[:8]
-
-    f_eval_8n = coset_NTT(f_poly,domain_8n)
-
-    table_eval_8n = coset_NTT(table_poly,domain_8n)
-    table_eval_8n += table_eval_8n[:8]
-
-    h1_eval_8n = coset_NTT(h1_poly,domain_8n)
-    h1_eval_8n += h1_eval_8n[:8]
-
-    h2_eval_8n = coset_NTT(h2_poly,domain_8n)
+    if domain_8n is None:
+        #get Fr
+        params = fr.Fr(gmpy2.mpz(0))
+        #get NTT domain
+        domain_8n = Radix2EvaluationDomain.new(8 * domain.size,params)
+
+    # Extend every polynomial to the 8n coset in one batched stage
+    polys = [z_poly, w_l_poly, w_r_poly, w_o_poly, w_4_poly,
+             z2_poly, f_poly, table_poly, h1_poly, h2_poly]
+    if l1_eval_8n is None:
+        polys.append(compute_first_lagrange_poly_scaled(domain, alpha.one()))
+    evals_8n = coset_NTT_many([FieldVector.from_list(p, fr.Fr) for p in polys], domain_8n)
+    if l1_eval_8n is None:
+        l1_eval_8n = evals_8n.pop()
+    (z_eval_8n, wl_eval_8n, wr_eval_8n, wo_eval_8n, w4_eval_8n,
+     z2_eval_8n, f_eval_8n, table_eval_8n, h1_eval_8n, h2_eval_8n) = evals_8n
 
     gate_constraints = compute_gate_constraint_satisfiability(
         domain,
@@ -180,6 +195,7 @@ def compute(domain: Radix2EvaluationDomain,
         prover_key,
         wl_eval_8n,wr_eval_8n,wo_eval_8n,w4_eval_8n,
         public_inputs_poly,
+        domain_8n,
     )
 
     permutation = compute_permutation_checks(
@@ -187,6 +203,8 @@ def compute(domain: Radix2EvaluationDomain,
         prover_key,
         wl_eval_8n,wr_eval_8n,wo_eval_8n,w4_eval_8n,z_eval_8n,
         alpha,beta,gamma,
+        domain_8n,
+        l1_eval_8n,
     )
 
     lookup = prover_key.lookup.compute_lookup_quotient_term(
@@ -205,16 +223,13 @@ def compute(domain: Radix2EvaluationDomain,
         epsilon,
         zeta,
         lookup_challenge,
+        domain_8n,
     )
-    quotient = []
-    for i in range(domain_8n.size):
-        numerator = gate_constraints[i].add(permutation[i])
-        numerator = numerator.add(lookup[i])
-        denominator = fr.Fr.inverse(prover_key.v_h_coset_8n[i])
-        res = numerator.mul(denominator)
-        quotient.append(res)
+    numerator = gate_constraints.add(permutation)
+    numerator = numerator.add(lookup)
+    quotient = numerator.mul(prover_key.v_h_coset_8n_inverse(domain_8n.size))
 
     quotient_poly = coset_INTT(quotient,domain_8n)
     hx = from_coeff_vec(quotient_poly)
 
-    return hx
\ No newline at end of file
+    return hx
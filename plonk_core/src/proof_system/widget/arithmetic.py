@@ -19,6 +19,8 @@ class Arith:
 
     # Computes the arithmetic gate contribution to the quotient polynomial at
     # the element of the domain at the given `index`.
+    # `index` may also be a slice of rows, with `wit_vals` holding FieldVectors
+    # for those rows; the contribution is then returned as a FieldVector.
     def compute_quotient_i(self, index: int, wit_vals: WitnessValues):
 
         mult = wit_vals.a_val.mul(wit_vals.b_val)
@@ -34,14 +36,9 @@ class Arith:
         b_high = b_high.mul(self.q_hr[1][index])
         f_high = f_high.mul(self.q_h4[1][index])
         
-        mid1 = mult.add(left)
-        mid2 = mid1.add(right)
-        mid3 = mid2.add(out)
-        mid4 = mid3.add(fourth)
-        mid5 = mid4.add(a_high)
-        mid6 = mid5.add(b_high)
-        mid7 = mid6.add(f_high)
-        mid8 = mid7.add(self.q_c[1][index])
+        # Sum the terms with a single reduction
+        mid8 = mult.add_many([left, right, out, fourth,
+                              a_high, b_high, f_high, self.q_c[1][index]])
 
         arith_val = mid8.mul(self.q_arith[1][index])
         return arith_val
@@ -52,7 +52,7 @@ class CAGate:
         x3_consistency = x3_l_sub_r.mul(kappa)
 
         # Check that `y_3` is correct
-        x1_x2_A = P.COEFF_A.mul(x1_x2)
+        x1_x2_A = x1_x2.mul(P.COEFF_A)
         y3_lhs = y1_y2.sub(x1_x2_A)
         y_3_D = y_3.mul(P.COEFF_D)
         y_3_D_x1_y2 = y_3_D.mul(x1_y2)
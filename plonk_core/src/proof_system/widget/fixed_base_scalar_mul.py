@@ -88,7 +88,7 @@ class FBSMGate:
         y_3_times_xy_alpha_times_acc_x_times_acc_y_times_coeff_d = y_3_times_xy_alpha_times_acc_x_times_acc_y.mul(P.COEFF_D)
         lhs_y = y_3.sub(y_3_times_xy_alpha_times_acc_x_times_acc_y_times_coeff_d)
         y_alpha_times_acc_y = y_alpha.mul(acc_y)
-        coeff_A_times_x_alpha = P.COEFF_A.mul(x_alpha)
+        coeff_A_times_x_alpha = x_alpha.mul(P.COEFF_A)
         coeff_A_times_x_alpha_times_acc_x = coeff_A_times_x_alpha.mul(acc_x)
         rhs_y = y_alpha_times_acc_y.sub(coeff_A_times_x_alpha_times_acc_x)
         y_acc_consistency = lhs_y.sub(rhs_y)
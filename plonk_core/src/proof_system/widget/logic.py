@@ -31,15 +31,15 @@ class LogicGate:
         kappa_cu = kappa_sq.mul(kappa)
         kappa_qu = kappa_cu.mul(kappa)
 
-        a_1 = four.mul(wit_vals.a_val)
+        a_1 = wit_vals.a_val.mul(four)
         a = custom_vals.a_next_val.sub(a_1)
         c_0 = delta(a)
 
-        b_1 = four.mul(wit_vals.b_val)
+        b_1 = wit_vals.b_val.mul(four)
         b = custom_vals.b_next_val.sub(b_1)
         c_1 = delta(b)
 
-        d_1 = four.mul(wit_vals.d_val)
+        d_1 = wit_vals.d_val.mul(four)
         d = custom_vals.d_next_val.sub(d_1)
         c_2 = delta(d)
 
@@ -85,9 +85,9 @@ def delta_xor_and(a: fr.Fr, b: fr.Fr, w: fr.Fr, c: fr.Fr, q_c: fr.Fr):
     eighty_one = fr.Fr.from_repr(81)
     eighty_three = fr.Fr.from_repr(83)
 
-    f_1_1 = four.mul(w)
+    f_1_1 = w.mul(four)
     f_1_2_1 = a.add(b)
-    f_1_2 = eighteen.mul(f_1_2_1)
+    f_1_2 = f_1_2_1.mul(eighteen)
     f_1 = f_1_1.sub(f_1_2)
     f_1 = f_1.add(eighty_one)
     f_1 = f_1.mul(w)
@@ -95,10 +95,10 @@ def delta_xor_and(a: fr.Fr, b: fr.Fr, w: fr.Fr, c: fr.Fr, q_c: fr.Fr):
     f_2_1_1 = a.square()
     f_2_1_2 = b.square()
     f_2_1 = f_2_1_1.add(f_2_1_2)
-    f_2 = eighteen.mul(f_2_1)
+    f_2 = f_2_1.mul(eighteen)
 
     f_3_1 = a.add(b)
-    f_3 = eighty_one.mul(f_3_1)
+    f_3 = f_3_1.mul(eighty_one)
 
     f = f_1.add(f_2)
     f = f.sub(f_3)
@@ -106,12 +106,12 @@ def delta_xor_and(a: fr.Fr, b: fr.Fr, w: fr.Fr, c: fr.Fr, q_c: fr.Fr):
     f = w.mul(f)
 
     e_1_1 = f_3_1.add(c)
-    e_1 = three.mul(e_1_1)
-    e_2 = two.mul(f)
+    e_1 = e_1_1.mul(three)
+    e_2 = f.mul(two)
     e = e_1.sub(e_2)
 
-    b_1_1=nine.mul(c)
-    b_1_2 = three.mul(f_3_1)
+    b_1_1 = c.mul(nine)
+    b_1_2 = f_3_1.mul(three)
     b_1 = b_1_1.sub(b_1_2)
     b = q_c.mul(b_1)
 
@@ -4,6 +4,9 @@ from dataclasses import dataclass
 from typing import List, Tuple
 from plonk_core.src.utils import lc
 from arithmetic import poly_add_poly,poly_mul_const
+from field_vector import FieldVector
+from plonk_core.src.proof_system.widget.mod import restrict_rows
+import parallel
 @dataclass
 class Lookup:
     # Lookup selector
@@ -20,55 +23,62 @@ class Lookup:
     # Compute lookup portion of quotient polynomial
     def compute_lookup_quotient_term(self,
         domain: Radix2EvaluationDomain,
-        wl_eval_8n: List[fr.Fr],
-        wr_eval_8n: List[fr.Fr],
-        wo_eval_8n: List[fr.Fr],
-        w4_eval_8n: List[fr.Fr],
-        f_eval_8n: List[fr.Fr],
-        table_eval_8n: List[fr.Fr],
-        h1_eval_8n: List[fr.Fr],
-        h2_eval_8n: List[fr.Fr],
-        z2_eval_8n: List[fr.Fr],
-        l1_eval_8n: List[fr.Fr],
+        wl_eval_8n: FieldVector,
+        wr_eval_8n: FieldVector,
+        wo_eval_8n: FieldVector,
+        w4_eval_8n: FieldVector,
+        f_eval_8n: FieldVector,
+        table_eval_8n: FieldVector,
+        h1_eval_8n: FieldVector,
+        h2_eval_8n: FieldVector,
+        z2_eval_8n: FieldVector,
+        l1_eval_8n: FieldVector,
         delta: fr.Fr,
         epsilon: fr.Fr,
         zeta: fr.Fr,
-        lookup_sep:fr.Fr):
+        lookup_sep:fr.Fr,
+        domain_8n: Radix2EvaluationDomain = None):
 
-        domain_8n:Radix2EvaluationDomain = Radix2EvaluationDomain.new(8 * domain.size,zeta)
+        if domain_8n is None:
+            domain_8n = Radix2EvaluationDomain.new(8 * domain.size,zeta)
 
-        # Initialize result list
-        result = []
+        table_next_eval_8n = table_eval_8n.shift(8)
+        h1_next_eval_8n = h1_eval_8n.shift(8)
+        z2_next_eval_8n = z2_eval_8n.shift(8)
 
-        # Calculate lookup quotient term for each index
-        for i in range(domain_8n.size):
-            quotient_i = self.compute_quotient_i(
-                i,
-                wl_eval_8n[i],
-                wr_eval_8n[i],
-                wo_eval_8n[i],
-                w4_eval_8n[i],
-                f_eval_8n[i],
-                table_eval_8n[i],
-                table_eval_8n[i + 8],
-                h1_eval_8n[i],
-                h1_eval_8n[i + 8],
-                h2_eval_8n[i],
-                z2_eval_8n[i],
-                z2_eval_8n[i + 8],
-                l1_eval_8n[i],
+        # Calculate lookup quotient term block by block
+        jobs = []
+        for rows in parallel.chunk_ranges(domain_8n.size):
+            jobs.append((
+                restrict_rows(self, rows),
+                slice(0, rows.stop - rows.start),
+                wl_eval_8n[rows],
+                wr_eval_8n[rows],
+                wo_eval_8n[rows],
+                w4_eval_8n[rows],
+                f_eval_8n[rows],
+                table_eval_8n[rows],
+                table_next_eval_8n[rows],
+                h1_eval_8n[rows],
+                h1_next_eval_8n[rows],
+                h2_eval_8n[rows],
+                z2_eval_8n[rows],
+                z2_next_eval_8n[rows],
+                l1_eval_8n[rows],
                 delta,
                 epsilon,
                 zeta,
                 lookup_sep
-            )
-            result.append(quotient_i)
+            ))
+        blocks = parallel.map_ordered(Lookup.compute_quotient_i, jobs)
 
-        return result
+        return FieldVector.concat(blocks)
     
+    # `index` may be a single row or a slice of rows; for a slice every
+    # per-row argument is a FieldVector over the same rows.
     def compute_quotient_i(
         self,
-        index: fr.Fr,
+        index,
         w_l_i: fr.Fr,
         w_r_i: fr.Fr,
         w_o_i: fr.Fr,
@@ -102,9 +112,9 @@ class Lookup:
         a = mid2.mul(lookup_sep)
 
         # z2(X) * (1+δ) * (ε+f(X)) * (ε*(1+δ) + t(X) + δt(Xω)) * lookup_sep^2
-        b_0 = epsilon.add(f_i)
-        b_1_1 = epsilon_one_plus_delta.add(table_i)
-        b_1_2 = delta.mul(table_i_next)
+        b_0 = f_i.add(epsilon)
+        b_1_1 = table_i.add(epsilon_one_plus_delta)
+        b_1_2 = table_i_next.mul(delta)
         b_1 = b_1_1.add(b_1_2)
         mid1 = z2_i.mul(one_plus_delta)
         mid2 = mid1.mul(b_0)
@@ -113,11 +123,11 @@ class Lookup:
 
         # − z2(Xω) * (ε*(1+δ) + h1(X) + δ*h2(X)) * (ε*(1+δ) + h2(X) + δ*h1(Xω))
         # * lookup_sep^2
-        c_0_1 = epsilon_one_plus_delta.add(h1_i)
-        c_0_2 = delta.mul(h2_i)
+        c_0_1 = h1_i.add(epsilon_one_plus_delta)
+        c_0_2 = h2_i.mul(delta)
         c_0 =c_0_1.add(c_0_2)
-        c_1_1 = epsilon_one_plus_delta.add(h2_i)
-        c_1_2 = delta.mul(h1_i_next)
+        c_1_1 = h2_i.add(epsilon_one_plus_delta)
+        c_1_2 = h1_i_next.mul(delta)
         c_1 = c_1_1.add(c_1_2)
         neg_z2_next = z2_i_next.neg()
         mid1 = neg_z2_next.mul(c_0)
@@ -1,5 +1,6 @@
 from bls12_381 import fr
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, replace
+from field_vector import FieldVector
 
 @dataclass
 class WitnessValues:
@@ -9,6 +10,21 @@ class WitnessValues:
     d_val: fr.Fr  # Fourth Value
 
 
+# Copy of a prover key widget that keeps only `rows` of its evaluation vectors.
+# Coefficient vectors and other data are dropped, so the copy is all a
+# quotient worker needs and is cheap to ship to another process.
+def restrict_rows(widget, rows):
+    changes = {}
+    for f in fields(widget):
+        value = getattr(widget, f.name)
+        if isinstance(value, tuple):
+            changes[f.name] = ([], value[1][rows])
+        elif isinstance(value, FieldVector):
+            changes[f.name] = value[rows]
+        else:
+            changes[f.name] = []
+    return replace(widget, **changes)
+
 def delta(f:fr.Fr):
     one = f.one()
     two = fr.Fr.from_repr(2)
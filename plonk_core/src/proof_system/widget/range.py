@@ -21,21 +21,21 @@ class RangeGate:
         kappa_sq = kappa.square()
         kappa_cu = kappa_sq.mul(kappa)
 
-        b_1_1 = four.mul(wit_vals.d_val)
+        b_1_1 = wit_vals.d_val.mul(four)
         f_b1 = wit_vals.c_val.sub(b_1_1)
         b_1 = delta(f_b1)
 
-        b_2_1 = four.mul(wit_vals.c_val)
+        b_2_1 = wit_vals.c_val.mul(four)
         b_2_2 = wit_vals.b_val.sub(b_2_1)
         f_b2 = delta(b_2_2)
         b_2 = f_b2.mul(kappa)
 
-        b_3_1 = four.mul(wit_vals.b_val)
+        b_3_1 = wit_vals.b_val.mul(four)
         b_3_2 = wit_vals.a_val.sub(b_3_1)
         f_b3 = delta(b_3_2)
         b_3 = f_b3.mul(kappa_sq)
 
-        b_4_1 = four.mul(wit_vals.a_val)
+        b_4_1 = wit_vals.a_val.mul(four)
         b_4_2 = custom_vals.d_next_val.sub(b_4_1)
         f_b4 = delta(b_4_2)
         b_4 = f_b4.mul(kappa_cu)
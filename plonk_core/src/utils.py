@@ -1,8 +1,9 @@
 # Linear combination of a series of values
 # For values [v_0, v_1,... v_k] returns:
 # v_0 + challenge * v_1 + ... + challenge^k  * v_k
+# The values are not modified (they may be prover key columns reused across proofs)
 def Multiset_lc(values, challenge):
-    kth_val = values.elements[-1]
+    kth_val = values.elements[-1][:]
     for val in reversed(values.elements[:-1]):
         for i in range(len(kth_val)):
             kth_val[i] = kth_val[i].mul(challenge)
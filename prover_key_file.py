@@ -0,0 +1,191 @@
+import sys
+import mmap
+import struct
+from dataclasses import MISSING, fields, is_dataclass
+from bls12_381 import fr
+from domain import Radix2EvaluationDomain
+from structure import AffinePointG1
+from srs import POINT_BYTES, encode_fq, decode_g1
+from field_vector import FieldVector
+from plonk_core.src.proof_system.prover_key import Prover_Key
+
+# Binary prover key layout (all integers little-endian):
+#   header: magic "PLONKPK\0", u32 version, u32 number of sections
+#   index: per section u16 name length, name, u8 kind, u64 offset, u64 count
+#   data: per section `count` field elements of 32 bytes (canonical value),
+#         or for POINTS sections `count` G1 points as in the binary SRS (x, y)
+# Section names are attribute paths into Prover_Key, with tuple members
+# numbered, e.g. "arithmetic.q_m.1" holds the 8n evaluations of q_m.
+# LIST sections are read as lists of fr.Fr, VECTOR sections as FieldVectors
+# and POINTS sections (version 2) as lists of AffinePointG1.
+MAGIC = b"PLONKPK\0"
+VERSION = 2
+HEADER = struct.Struct("<8sII")
+NAME_LEN = struct.Struct("<H")
+ENTRY = struct.Struct("<BQQ")
+ELEM_BYTES = 32
+
+LIST = 0
+VECTOR = 1
+POINTS = 2
+
+def section_kind(value):
+    if isinstance(value, FieldVector):
+        return VECTOR
+    if len(value) and isinstance(value[0], AffinePointG1):
+        return POINTS
+    return LIST
+
+def section_bytes(kind, count):
+    return count * (POINT_BYTES if kind == POINTS else ELEM_BYTES)
+
+def decode_elements(buf, offset, count):
+    end = offset + count * ELEM_BYTES
+    return [int.from_bytes(buf[pos:pos + ELEM_BYTES], "little") for pos in range(offset, end, ELEM_BYTES)]
+
+# FieldVector backed by a section of a memory-mapped prover key file.
+# The values are decoded on first access, so sections that a proof step never
+# touches are never loaded. Pickles as a plain FieldVector.
+class MappedFieldVector(FieldVector):
+    def __init__(self, buf, offset, count, field_type):
+        self.buf = buf
+        self.offset = offset
+        self.count = count
+        self.field_type = field_type
+        self._values = None
+
+    @property
+    def values(self):
+        if self._values is None:
+            ints = decode_elements(self.buf, self.offset, self.count)
+            self._values = FieldVector.from_canonical(ints, self.field_type).values
+        return self._values
+
+    @values.setter
+    def values(self, values):
+        self._values = values
+
+    def __len__(self):
+        if self._values is None:
+            return self.count
+        return len(self._values)
+
+    def __reduce__(self):
+        return (FieldVector, (self.values, self.field_type))
+
+# (name, value) for every list or FieldVector reachable from the dataclass `obj`
+def collect_sections(obj, prefix, sections):
+    for f in fields(obj):
+        value = getattr(obj, f.name)
+        name = prefix + f.name
+        if isinstance(value, (list, FieldVector)):
+            sections.append((name, value))
+        elif isinstance(value, tuple):
+            for i, part in enumerate(value):
+                sections.append((f"{name}.{i}", part))
+        elif is_dataclass(value):
+            collect_sections(value, name + ".", sections)
+    return sections
+
+def write_prover_key(pk: Prover_Key, filename):
+    sections = collect_sections(pk, "", [])
+    index_size = HEADER.size
+    for name, _ in sections:
+        index_size += NAME_LEN.size + len(name.encode()) + ENTRY.size
+
+    with open(filename, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(sections)))
+        offset = index_size
+        for name, value in sections:
+            encoded = name.encode()
+            kind = section_kind(value)
+            f.write(NAME_LEN.pack(len(encoded)) + encoded + ENTRY.pack(kind, offset, len(value)))
+            offset += section_bytes(kind, len(value))
+        for _, value in sections:
+            kind = section_kind(value)
+            if kind == POINTS:
+                f.write(b"".join(encode_fq(p.x) + encode_fq(p.y) for p in value))
+                continue
+            if kind == VECTOR:
+                ints = value.to_canonical()
+            else:
+                ints = [e.into_repr() for e in value]
+            f.write(b"".join(int(x).to_bytes(ELEM_BYTES, "little") for x in ints))
+
+def is_binary_prover_key(filename):
+    with open(filename, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+# Build an instance of the dataclass `cls` from the sections under `prefix`.
+# Fields without sections keep their defaults.
+def build_from_sections(cls, prefix, sections):
+    kwargs = {}
+    for f in fields(cls):
+        name = prefix + f.name
+        if name in sections:
+            kwargs[f.name] = sections[name]()
+        elif name + ".0" in sections:
+            parts = []
+            while f"{name}.{len(parts)}" in sections:
+                parts.append(sections[f"{name}.{len(parts)}"]())
+            kwargs[f.name] = tuple(parts)
+        elif is_dataclass(f.type) and f.default is MISSING:
+            kwargs[f.name] = build_from_sections(f.type, name + ".", sections)
+    return cls(**kwargs)
+
+# Open a binary prover key. The file is memory-mapped; with `lazy` the
+# FieldVector sections (the 8n evaluations and v_h_coset_8n) are decoded on
+# first access, the coefficient lists are decoded right away.
+def read_prover_key(filename, lazy=True):
+    with open(filename, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, num_sections = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version not in (1, VERSION):
+        raise ValueError(f"{filename} is not a binary prover key")
+
+    sections = {}
+    pos = HEADER.size
+    for _ in range(num_sections):
+        (name_len,) = NAME_LEN.unpack_from(buf, pos)
+        pos += NAME_LEN.size
+        name = bytes(buf[pos:pos + name_len]).decode()
+        pos += name_len
+        kind, offset, count = ENTRY.unpack_from(buf, pos)
+        pos += ENTRY.size
+        if kind == POINTS:
+            loader = lambda o=offset, c=count: [decode_g1(buf, o + i * POINT_BYTES) for i in range(c)]
+        elif kind == VECTOR and lazy:
+            loader = lambda o=offset, c=count: MappedFieldVector(buf, o, c, fr.Fr)
+        elif kind == VECTOR:
+            loader = lambda o=offset, c=count: FieldVector.from_canonical(decode_elements(buf, o, c), fr.Fr)
+        else:
+            loader = lambda o=offset, c=count: FieldVector.from_canonical(decode_elements(buf, o, c), fr.Fr).to_list()
+        sections[name] = loader
+
+    pk = build_from_sections(Prover_Key, "", sections)
+    # Commitments are tied to the SRS they were made with; ones stored
+    # without its fingerprint cannot be checked and are dropped
+    if pk.fixed_commitments_srs is None:
+        pk.fixed_commitments = None
+    return pk
+
+# Convert a text prover key (the `pk.txt` format) to the binary format:
+#   python3 prover_key_file.py pk.txt pk.bin [params.txt]
+# The n-domain sigma evaluations (`Permutation.sigma_evaluations`) and the
+# inverse vanishing polynomial evaluations (`Prover_Key.v_h_coset_8n_inverse`)
+# are added, so proofs from the binary key skip computing them. Given the
+# SRS, so are the commitments of `Prover_Key.fixed_commitments`, with the
+# fingerprint of that SRS; proving with another SRS computes them again.
+def convert_prover_key(text_file, binary_file, srs_file=None):
+    from load import read_pk_data, read_pp_data
+    pk = read_pk_data(text_file)
+    domain = Radix2EvaluationDomain.new(len(pk.permutation.left_sigma[1]) // 8, fr.Fr.zero())
+    pk.permutation.sigma_evaluations(domain)
+    pk.v_h_coset_8n_inverse(8 * domain.size)
+    if srs_file is not None:
+        from gen_proof import fixed_commitments
+        fixed_commitments(read_pp_data(srs_file), pk, domain)
+    write_prover_key(pk, binary_file)
+
+if __name__ == "__main__":
+    convert_prover_key(*sys.argv[1:4])
@@ -0,0 +1,166 @@
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+import socketserver
+from concurrent.futures import Future
+from load import read_pk_data,read_pp_data,read_cs_data,read_fixed_base_table,cached_read,witness_path
+from composer import StandardComposer
+import gen_proof
+from transcript import transcript
+
+# Maximum number of jobs waiting to be proved
+QUEUE_SIZE = int(os.environ.get("PLONK_QUEUE_SIZE", "64"))
+
+TRANSCRIPT_INIT = b"Merkle tree"
+
+WIRE_NAMES = ["w_l", "w_r", "w_o", "w_4"]
+
+# Witness files of a job: either "witness", a list of the w_l, w_r, w_o and
+# w_4 files, or "witness_dir", a directory holding the w_*_scalar files
+def job_witness_files(job):
+    if "witness" in job:
+        files = job["witness"]
+        if len(files) != len(WIRE_NAMES):
+            raise ValueError(f"expected {len(WIRE_NAMES)} witness files, got {len(files)}")
+        return files
+    if "witness_dir" in job:
+        return [witness_path(os.path.join(job["witness_dir"], name + "_scalar")) for name in WIRE_NAMES]
+    raise ValueError("job has neither 'witness' nor 'witness_dir'")
+
+# Keeps the SRS, prover key and circuit resident and proves witness jobs one
+# after another on a worker thread. Jobs wait in a bounded queue; each result
+# is a JSON-ready dict with the serialized proof (hex) and per-job timing.
+# The witness-independent data (`gen_proof.precompute`) is computed with the
+# first job and shared by all later ones.
+class ProverService:
+    def __init__(self, pp, pk, cs, queue_size=QUEUE_SIZE):
+        self.pp = pp
+        self.pk = pk
+        self.cs = cs
+        self.precomputed = None
+        self.jobs = queue.Queue(maxsize=queue_size)
+        self.worker = threading.Thread(target=self.run, daemon=True)
+        self.worker.start()
+
+    @classmethod
+    def from_files(cls, pp_file, pk_file, cs_file, queue_size=QUEUE_SIZE):
+        pp = read_fixed_base_table(cached_read(read_pp_data, pp_file), pp_file)
+        pk = cached_read(read_pk_data, pk_file)
+        cs = StandardComposer.from_data(cached_read(read_cs_data, cs_file))
+        return cls(pp, pk, cs, queue_size)
+
+    # Queue `job` and return a Future for its result. With `block` false,
+    # raises queue.Full when the queue is at capacity.
+    def submit(self, job, block=True):
+        if not isinstance(job, dict):
+            raise ValueError("a job must be a JSON object")
+        future = Future()
+        self.jobs.put((job, future, time.time()), block=block)
+        return future
+
+    def run(self):
+        while True:
+            job, future, queued_at = self.jobs.get()
+            if job is None:
+                break
+            future.set_result(self.prove(job, queued_at))
+
+    def prove(self, job, queued_at):
+        start = time.time()
+        result = {"id": job.get("id")}
+        try:
+            if self.precomputed is None:
+                self.precomputed = gen_proof.precompute(self.pp, self.pk, self.cs)
+            proof = gen_proof.gen_proof(self.pp, self.pk, self.cs,
+                                        transcript.Transcript.new(TRANSCRIPT_INIT),
+                                        job_witness_files(job), self.precomputed)
+            result["ok"] = True
+            result["proof"] = bytes(proof.serialize([])).hex()
+        except Exception as e:
+            result["ok"] = False
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["timing"] = {"queued": start - queued_at, "prove": time.time() - start}
+        return result
+
+    # Stop after the jobs already queued
+    def close(self):
+        self.jobs.put((None, None, None))
+        self.worker.join()
+
+def error_response(job_id, message):
+    return {"id": job_id, "ok": False, "error": message}
+
+# Read JSON-lines jobs from `lines` and write one JSON line per result to `out`,
+# in job order. Reading blocks while the queue is full.
+def serve_lines(service, lines, out):
+    futures = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            futures.append(service.submit(json.loads(line)))
+        except ValueError as e:
+            done = Future()
+            done.set_result(error_response(None, f"invalid job: {e}"))
+            futures.append(done)
+        # Write out the results that are ready, keeping the order
+        while futures and futures[0].done():
+            out.write(json.dumps(futures.pop(0).result()) + "\n")
+            out.flush()
+    for future in futures:
+        out.write(json.dumps(future.result()) + "\n")
+        out.flush()
+
+# Unix socket transport: every connection sends JSON-lines jobs and receives
+# one JSON line per job. Jobs arriving while the queue is full are rejected.
+class JobHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job = json.loads(line)
+                response = self.server.service.submit(job, block=False).result()
+            except ValueError as e:
+                response = error_response(None, f"invalid job: {e}")
+            except queue.Full:
+                response = error_response(job.get("id"), "job queue is full")
+            self.wfile.write((json.dumps(response) + "\n").encode())
+            self.wfile.flush()
+
+def serve_socket(service, path):
+    if os.path.exists(path):
+        os.remove(path)
+    with socketserver.ThreadingUnixStreamServer(path, JobHandler) as server:
+        # Idle connections must not keep the process alive on shutdown
+        server.daemon_threads = True
+        server.service = service
+        server.serve_forever()
+
+# Prover daemon:
+#   python3 prover_service.py --stdin
+#   python3 prover_service.py --socket /tmp/plonk.sock
+# A job is a JSON object such as {"id": 1, "witness_dir": "jobs/1"}.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pp", default="params.txt")
+    parser.add_argument("--pk", default="pk.txt")
+    parser.add_argument("--cs", default="cs.txt")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    transport = parser.add_mutually_exclusive_group(required=True)
+    transport.add_argument("--socket")
+    transport.add_argument("--stdin", action="store_true")
+    args = parser.parse_args()
+
+    service = ProverService.from_files(args.pp, args.pk, args.cs, args.queue_size)
+    if args.stdin:
+        serve_lines(service, sys.stdin, sys.stdout)
+        service.close()
+    else:
+        serve_socket(service, args.socket)
@@ -0,0 +1,106 @@
+import sys
+import mmap
+import struct
+import gmpy2
+from bls12_381 import fq
+from structure import AffinePointG1, AffinePointG2, G2Coordinate, UniversalParams
+
+# Binary SRS layout (all integers little-endian):
+#   header: magic "PLONKSRS", u32 version, u32 len(powers_of_g), u32 len(powers_of_gamma_g)
+#   powers_of_g, then powers_of_gamma_g: x, y per point
+#   h, then beta_h: x.c0, x.c1, y.c0, y.c1
+# Every coordinate is its canonical value in 48 bytes.
+MAGIC = b"PLONKSRS"
+VERSION = 1
+HEADER = struct.Struct("<8sIII")
+COORD_BYTES = 48
+POINT_BYTES = 2 * COORD_BYTES
+G2_BYTES = 4 * COORD_BYTES
+
+def encode_fq(e):
+    return int(e.into_repr()).to_bytes(COORD_BYTES, "little")
+
+def decode_fq(buf, pos):
+    return fq.Fq.from_repr(gmpy2.mpz(int.from_bytes(buf[pos:pos + COORD_BYTES], "little")))
+
+def decode_g1(buf, pos):
+    return AffinePointG1(x=decode_fq(buf, pos), y=decode_fq(buf, pos + COORD_BYTES))
+
+def decode_g2(buf, pos):
+    x = G2Coordinate(c0=decode_fq(buf, pos), c1=decode_fq(buf, pos + COORD_BYTES))
+    y = G2Coordinate(c0=decode_fq(buf, pos + 2 * COORD_BYTES), c1=decode_fq(buf, pos + 3 * COORD_BYTES))
+    return AffinePointG2(x=x, y=y)
+
+# G1 points stored back to back in `buf` (e.g. a memory-mapped SRS file),
+# decoded only when accessed. Indexing with an int returns one AffinePointG1,
+# a slice returns a list holding just the points in that range.
+# Pickles as a plain list.
+class MappedPoints:
+    def __init__(self, buf, offset, count):
+        self.buf = buf
+        self.offset = offset
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("point index out of range")
+        return decode_g1(self.buf, self.offset + index * POINT_BYTES)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield decode_g1(self.buf, self.offset + i * POINT_BYTES)
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+def is_binary_srs(filename):
+    with open(filename, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+def write_srs(pp: UniversalParams, filename):
+    with open(filename, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(pp.powers_of_g), len(pp.powers_of_gamma_g)))
+        for points in (pp.powers_of_g, pp.powers_of_gamma_g):
+            for p in points:
+                f.write(encode_fq(p.x) + encode_fq(p.y))
+        for p in (pp.h, pp.beta_h):
+            f.write(encode_fq(p.x.c0) + encode_fq(p.x.c1) + encode_fq(p.y.c0) + encode_fq(p.y.c1))
+
+# Open a binary SRS. With `lazy` the file is memory-mapped and the G1 powers
+# are decoded on access (a commitment of degree d reads only d points);
+# otherwise every point is decoded up front.
+def read_srs(filename, lazy=True):
+    with open(filename, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, num_g, num_gamma_g = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{filename} is not a binary SRS file")
+
+    pos = HEADER.size
+    powers_of_g = MappedPoints(buf, pos, num_g)
+    pos += num_g * POINT_BYTES
+    powers_of_gamma_g = MappedPoints(buf, pos, num_gamma_g)
+    pos += num_gamma_g * POINT_BYTES
+    h = decode_g2(buf, pos)
+    beta_h = decode_g2(buf, pos + G2_BYTES)
+
+    if not lazy:
+        powers_of_g = list(powers_of_g)
+        powers_of_gamma_g = list(powers_of_gamma_g)
+    return UniversalParams(powers_of_g, powers_of_gamma_g, h, beta_h)
+
+# Convert a text SRS (the `params.txt` format) to the binary format:
+#   python3 srs.py params.txt params.srs
+def convert_srs(text_file, binary_file):
+    from load import read_pp_data
+    write_srs(read_pp_data(text_file), binary_file)
+
+if __name__ == "__main__":
+    convert_srs(sys.argv[1], sys.argv[2])
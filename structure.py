@@ -52,6 +52,8 @@ class UniversalParams:
     powers_of_gamma_g: List[AffinePointG1]
     h: any
     beta_h: any
+    # Optional fixed-base table for powers_of_g (see fixed_base.FixedBaseTable)
+    powers_of_g_table: any = None
 
 
 @dataclass
@@ -0,0 +1,69 @@
+import sys
+import os
+import random
+import hashlib
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bls12_381 import fr
+from domain import Radix2EvaluationDomain
+from arithmetic import NTT, INTT, coset_NTT, evaluate, evaluate_many, batch_inversion, MSM, convert_to_bigints
+from load import read_pp_data, read_cs_data
+from composer import StandardComposer
+from transcript import transcript
+import gen_proof
+from helpers import random_scalars, random_prover_key
+
+# Prints a digest of the outputs of the field primitives and of a whole
+# proof under the field backend selected by PLONK_FIELD_BACKEND. Every value
+# is hashed in canonical or serialized form, so the output of both backends
+# must be identical (see tests/test_backends.py):
+#   PLONK_FIELD_BACKEND=canonical python3 tests/backend_outputs.py
+def canonical(elems):
+    return [int(e.into_repr()) for e in elems]
+
+def point_bytes(point):
+    return bytes(point.serialize([]))
+
+def proof_bytes(proof):
+    names = ["a_comm", "b_comm", "c_comm", "d_comm", "z_comm", "f_comm",
+             "h_1_comm", "h_2_comm", "z_2_comm"] + [f"t_{i}_comm" for i in range(1, 9)]
+    points = [getattr(proof, name) for name in names]
+    points += [proof.aw_opening.w, proof.saw_opening.w]
+    evaluations = proof.evaluations
+    scalars = (list(vars(evaluations.wire_evals).values())
+               + list(vars(evaluations.perm_evals).values())
+               + list(vars(evaluations.lookup_evals).values())
+               + [v for _, v in evaluations.custom_evals.vals])
+    return b"".join(bytes(x.serialize([])) for x in points + scalars)
+
+def outputs(with_proof=True):
+    rng = random.Random(2)
+    pp = read_pp_data("params.txt")
+    domain = Radix2EvaluationDomain.new(64, fr.Fr.zero())
+    coeffs = random_scalars(rng, 64)
+    x = random_scalars(rng, 1)[0]
+    exp = rng.randrange(1, int(fr.Fr.MODULUS))
+    inverses = coeffs[:]
+    batch_inversion(inverses)
+    res = {
+        "ntt": canonical(NTT(domain, coeffs)),
+        "intt": canonical(INTT(domain, coeffs)),
+        "coset_ntt": canonical(coset_NTT(coeffs, domain)),
+        "evaluate": canonical([evaluate(coeffs, x)]),
+        "evaluate_many": canonical(sum(evaluate_many([coeffs, coeffs[:7]], [x, x.square()]), [])),
+        "pow": canonical([x.pow(5), x.pow(exp)]),
+        "inverse": canonical([fr.Fr.inverse(e) for e in coeffs]),
+        "batch_inversion": canonical(inverses),
+        "msm": point_bytes(MSM(pp.powers_of_g, convert_to_bigints(coeffs), fr.Fr.zero()).to_affine()).hex(),
+    }
+    if with_proof:
+        cs = StandardComposer.from_data(read_cs_data("cs.txt"))
+        pk = random_prover_key(rng, cs.circuit_bound())
+        proof = gen_proof.gen_proof(pp, pk, cs, transcript.Transcript.new(b"Merkle tree"))
+        res["proof"] = proof_bytes(proof).hex()
+    return res
+
+if __name__ == "__main__":
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    for name, value in outputs("--no-proof" not in sys.argv).items():
+        print(name, hashlib.sha256(repr(value).encode()).hexdigest())
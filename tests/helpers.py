@@ -0,0 +1,29 @@
+import random
+import gmpy2
+from bls12_381 import fr
+from field_vector import FieldVector
+from plonk_core.src.proof_system.prover_key import Prover_Key
+from plonk_core.src.proof_system.widget.arithmetic import Arith
+from plonk_core.src.proof_system.widget.lookup import Lookup
+from plonk_core.src.proof_system.permutation import Permutation
+
+# Random field elements from a seeded generator, built from canonical
+# integers so that the same seed gives the same elements on every backend
+def random_scalars(rng: random.Random, count):
+    m = int(fr.Fr.MODULUS)
+    return [fr.Fr.from_repr(gmpy2.mpz(rng.randrange(1, m))) for _ in range(count)]
+
+def random_vector(rng: random.Random, count):
+    return FieldVector.from_list(random_scalars(rng, count), fr.Fr)
+
+# A prover key for a circuit of size `n` whose polynomials are random
+# (coefficients of length n, evaluations over the 8n coset)
+def random_prover_key(rng: random.Random, n):
+    def selector():
+        return (random_scalars(rng, n), random_vector(rng, 8 * n))
+    arithmetic = Arith(*[selector() for _ in range(10)])
+    lookup = Lookup(selector(), *[random_scalars(rng, n) for _ in range(4)])
+    permutation = Permutation(selector(), selector(), selector(), selector(),
+                              random_vector(rng, 8 * n))
+    return Prover_Key(arithmetic, selector(), selector(), lookup, selector(), selector(),
+                      permutation, random_vector(rng, 8 * n))
@@ -0,0 +1,19 @@
+import os
+import sys
+import subprocess
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend_outputs.py")
+
+# The backend is fixed when `field` is imported, so each one runs in its own process
+def backend_outputs(backend):
+    env = dict(os.environ, PLONK_FIELD_BACKEND=backend, PLONK_WORKERS="1")
+    out = subprocess.run([sys.executable, SCRIPT], env=env, check=True,
+                         capture_output=True, text=True).stdout
+    return dict(line.split() for line in out.splitlines())
+
+def test_montgomery_and_canonical_backends_agree():
+    montgomery = backend_outputs("montgomery")
+    canonical = backend_outputs("canonical")
+    assert "proof" in montgomery
+    for name, digest in montgomery.items():
+        assert canonical[name] == digest, f"{name} differs between backends"
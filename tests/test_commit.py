@@ -0,0 +1,30 @@
+import random
+import parallel
+from bls12_381 import fr
+from load import read_pp_data
+from KZG import kzg10
+from helpers import random_scalars
+
+# The commitments, including the blinding of hiding ones, must not depend on
+# whether they are computed serially or in worker processes
+def commit(pp, polys, workers):
+    parallel.set_workers(workers)
+    try:
+        comms, rands = kzg10.commit_poly(pp, polys, fr.Fr.zero())
+    finally:
+        parallel.set_workers(1)
+        parallel.shutdown()
+    return ([bytes(c.commitment.value.serialize([])) for c in comms],
+            [[r.value for r in rand.blind_poly] for rand in rands])
+
+def test_hiding_commitments_match_across_workers():
+    rng = random.Random(8)
+    pp = read_pp_data("params.txt")
+    polys = [kzg10.LabeledPoly.new(label="a", hiding_bound=1, poly=random_scalars(rng, 32)),
+             kzg10.LabeledPoly.new(label="b", hiding_bound=None, poly=random_scalars(rng, 32)),
+             kzg10.LabeledPoly.new(label="c", hiding_bound=2, poly=random_scalars(rng, 32))]
+    serial = commit(pp, polys, 1)
+    assert serial == commit(pp, polys, 2)
+    comms, rands = serial
+    assert len(rands[0]) == 3 and rands[1] == [] and len(rands[2]) == 4
+    assert rands[0] != rands[2][:3]
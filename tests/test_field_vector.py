@@ -0,0 +1,25 @@
+import random
+from bls12_381 import fr
+from arithmetic import batch_inversion
+from field_vector import FieldVector
+from helpers import random_scalars
+
+def test_batch_inversion_of_a_vector_skips_zeros():
+    xs = random_scalars(random.Random(5), 32)
+    for i in (0, 7, 31):
+        xs[i] = fr.Fr.zero()
+    v = FieldVector.from_list(xs, fr.Fr)
+    batch_inversion(v)
+    for x, inv in zip(xs, v):
+        if x.value == 0:
+            assert inv.value == 0
+        else:
+            assert x.mul(inv).value == x.one().value
+
+def test_prefix_products():
+    xs = random_scalars(random.Random(6), 32)
+    products = FieldVector.from_list(xs, fr.Fr).prefix_products()
+    acc = xs[0].one()
+    for x, p in zip(xs, products):
+        assert p.value == acc.value
+        acc = acc.mul(x)
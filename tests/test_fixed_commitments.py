@@ -0,0 +1,46 @@
+import random
+import dataclasses
+from bls12_381 import fr
+from domain import Radix2EvaluationDomain
+from load import read_pp_data
+import gen_proof
+import prover_key_file
+from helpers import random_prover_key
+
+N = 16
+
+def point_values(points):
+    return [(p.x.into_repr(), p.y.into_repr()) for p in points]
+
+# Fixed commitments kept on a prover key are reused only with the SRS they
+# were computed with
+def test_fixed_commitments_follow_the_srs(tmp_path):
+    pp = read_pp_data("params.txt")
+    other_pp = dataclasses.replace(pp, powers_of_g=pp.powers_of_g[1:])
+    domain = Radix2EvaluationDomain.new(N, fr.Fr.zero())
+    pk = random_prover_key(random.Random(25), N)
+
+    commitments = point_values(gen_proof.fixed_commitments(pp, pk, domain))
+    assert point_values(gen_proof.fixed_commitments(pp, pk, domain)) == commitments
+
+    filename = str(tmp_path / "pk.bin")
+    prover_key_file.write_prover_key(pk, filename)
+    loaded = prover_key_file.read_prover_key(filename)
+    assert point_values(loaded.fixed_commitments) == commitments
+    assert point_values(gen_proof.fixed_commitments(pp, loaded, domain)) == commitments
+
+    other = point_values(gen_proof.fixed_commitments(other_pp, loaded, domain))
+    assert other != commitments
+    assert point_values(loaded.fixed_commitments_srs) == point_values(other_pp.powers_of_g[:2])
+
+# Commitments stored without the SRS fingerprint are dropped on load
+def test_commitments_without_fingerprint_are_dropped(tmp_path):
+    pp = read_pp_data("params.txt")
+    domain = Radix2EvaluationDomain.new(N, fr.Fr.zero())
+    pk = random_prover_key(random.Random(26), N)
+    gen_proof.fixed_commitments(pp, pk, domain)
+    pk.fixed_commitments_srs = None
+
+    filename = str(tmp_path / "pk.bin")
+    prover_key_file.write_prover_key(pk, filename)
+    assert prover_key_file.read_prover_key(filename).fixed_commitments is None
@@ -0,0 +1,33 @@
+import random
+import gmpy2
+import pytest
+import field
+from bls12_381 import fr, fq
+
+@pytest.fixture
+def restore_backend():
+    default = field.INVERSE_BACKEND
+    yield
+    field.set_inverse_backend(default)
+
+# Every inversion backend must return the same inverse for random elements
+# of Fr and Fq, and that inverse must multiply back to one
+@pytest.mark.parametrize("cls", [fr.Fr, fq.Fq])
+def test_inverse_backends_agree(cls, restore_backend):
+    rng = random.Random(19)
+    elements = [cls.from_repr(gmpy2.mpz(rng.randrange(1, int(cls.MODULUS)))) for _ in range(200)]
+    results = {}
+    for name in field.INVERSE_BACKENDS:
+        field.set_inverse_backend(name)
+        results[name] = [cls.inverse(e).value for e in elements]
+    for name, values in results.items():
+        assert values == results["binary"], f"{name} inverses differ from binary"
+    one = elements[0].one().value
+    for e, inv in zip(elements, results["binary"]):
+        assert e.mul(cls(inv)).value == one
+
+@pytest.mark.parametrize("name", field.INVERSE_BACKENDS)
+def test_inverse_of_zero(name, restore_backend):
+    field.set_inverse_backend(name)
+    assert fr.Fr.inverse(fr.Fr.zero()) is None
+    assert fr.Fr.inverse(gmpy2.mpz(0)) is None
@@ -0,0 +1,62 @@
+import random
+from bls12_381 import fr
+from domain import Radix2EvaluationDomain
+from arithmetic import INTT, evaluate
+from plonk_core.src.proof_system import linearisation_poly
+from helpers import random_scalars, random_prover_key
+
+N = 16
+
+# `linearisation_poly.compute` takes the wire and sigma evaluations from the
+# Lagrange coefficients; they must match evaluating the coefficient forms
+def test_evaluations_match_coefficient_evaluation():
+    rng = random.Random(22)
+    domain = Radix2EvaluationDomain.new(N, fr.Fr.zero())
+    pk = random_prover_key(rng, N)
+    w_scalars = [random_scalars(rng, N) for _ in range(4)]
+    w_polys = [INTT(domain, w_scalar) for w_scalar in w_scalars]
+    t_polys = [random_scalars(rng, N) for _ in range(8)]
+    z_poly, z2_poly, f_poly, h1_poly, h2_poly, table_poly = [random_scalars(rng, N) for _ in range(6)]
+    challenges = random_scalars(rng, 12)
+    z = challenges[-1]
+    z_next = z.mul(domain.group_gen)
+
+    _, proof_evaluations = linearisation_poly.compute(
+        domain, pk, *challenges, *w_polys, *t_polys,
+        z_poly, z2_poly, f_poly, h1_poly, h2_poly, table_poly, w_scalars)
+
+    a_poly, b_poly, c_poly, d_poly = w_polys
+    wire_evals = proof_evaluations.wire_evals
+    assert wire_evals.a_eval.value == evaluate(a_poly, z).value
+    assert wire_evals.b_eval.value == evaluate(b_poly, z).value
+    assert wire_evals.c_eval.value == evaluate(c_poly, z).value
+    assert wire_evals.d_eval.value == evaluate(d_poly, z).value
+
+    perm_evals = proof_evaluations.perm_evals
+    assert perm_evals.left_sigma_eval.value == evaluate(pk.permutation.left_sigma[0], z).value
+    assert perm_evals.right_sigma_eval.value == evaluate(pk.permutation.right_sigma[0], z).value
+    assert perm_evals.out_sigma_eval.value == evaluate(pk.permutation.out_sigma[0], z).value
+    assert perm_evals.permutation_eval.value == evaluate(z_poly, z_next).value
+
+    lookup_evals = proof_evaluations.lookup_evals
+    assert lookup_evals.q_lookup_eval.value == evaluate(pk.lookup.q_lookup[0], z).value
+    assert lookup_evals.z2_next_eval.value == evaluate(z2_poly, z_next).value
+    assert lookup_evals.h1_eval.value == evaluate(h1_poly, z).value
+    assert lookup_evals.h1_next_eval.value == evaluate(h1_poly, z_next).value
+    assert lookup_evals.h2_eval.value == evaluate(h2_poly, z).value
+    assert lookup_evals.f_eval.value == evaluate(f_poly, z).value
+    assert lookup_evals.table_eval.value == evaluate(table_poly, z).value
+    assert lookup_evals.table_next_eval.value == evaluate(table_poly, z_next).value
+
+    custom_evals = dict(proof_evaluations.custom_evals.vals)
+    arith = pk.arithmetic
+    assert custom_evals["q_arith_eval"].value == evaluate(arith.q_arith[0], z).value
+    assert custom_evals["q_c_eval"].value == evaluate(arith.q_c[0], z).value
+    assert custom_evals["q_l_eval"].value == evaluate(arith.q_l[0], z).value
+    assert custom_evals["q_r_eval"].value == evaluate(arith.q_r[0], z).value
+    assert custom_evals["q_hl_eval"].value == evaluate(arith.q_hl[0], z).value
+    assert custom_evals["q_hr_eval"].value == evaluate(arith.q_hr[0], z).value
+    assert custom_evals["q_h4_eval"].value == evaluate(arith.q_h4[0], z).value
+    assert custom_evals["a_next_eval"].value == evaluate(a_poly, z_next).value
+    assert custom_evals["b_next_eval"].value == evaluate(b_poly, z_next).value
+    assert custom_evals["d_next_eval"].value == evaluate(d_poly, z_next).value
@@ -0,0 +1,66 @@
+import os
+import time
+import threading
+import load
+
+def read_text(filename):
+    with open(filename) as file:
+        return file.read()
+
+def fill_cache(cache_dir, count, age_days):
+    mtime = time.time() - age_days * 86400
+    for i in range(count):
+        path = os.path.join(cache_dir, f"entry-{i}.pickle")
+        with open(path, "wb") as file:
+            file.write(b"x" * 1024)
+        os.utime(path, (mtime, mtime))
+
+def read_concurrently(cache_dir, filenames):
+    barrier = threading.Barrier(len(filenames))
+    results = {}
+    errors = []
+    def read(filename):
+        try:
+            barrier.wait()
+            results[filename] = load.cached_read(read_text, filename, cache_dir)
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=read, args=(f,)) for f in filenames]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    return results
+
+def write_inputs(tmp_path, count, tag=0):
+    filenames = []
+    for i in range(count):
+        filename = str(tmp_path / f"input-{tag}-{i}.txt")
+        with open(filename, "w") as file:
+            file.write(f"input {tag} {i}\n")
+        filenames.append(filename)
+    return filenames
+
+# Several loads evicting the same cache at once (as in main.py) must not
+# fail on entries another load already removed
+def test_concurrent_reads_of_a_cache_over_its_size_limit(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    os.makedirs(cache_dir)
+    monkeypatch.setattr(load, "CACHE_MAX_MB", 0)
+    filenames = write_inputs(tmp_path, 8)
+    for _ in range(5):
+        fill_cache(cache_dir, 500, 0)
+        results = read_concurrently(cache_dir, filenames)
+        assert results == {f: read_text(f) for f in filenames}
+    assert os.listdir(cache_dir) == []
+
+def test_concurrent_reads_of_a_cache_over_its_age_limit(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    os.makedirs(cache_dir)
+    for tag in range(5):
+        fill_cache(cache_dir, 500, load.CACHE_MAX_AGE_DAYS + 1)
+        filenames = write_inputs(tmp_path, 8, tag)
+        results = read_concurrently(cache_dir, filenames)
+        assert results == {f: read_text(f) for f in filenames}
+        assert [name for name in os.listdir(cache_dir) if name.startswith("entry-")] == []
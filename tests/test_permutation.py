@@ -0,0 +1,56 @@
+import random
+from bls12_381 import fr
+from domain import Radix2EvaluationDomain
+from arithmetic import INTT, from_coeff_vec
+from plonk_core.src.permutation import constants, mod
+from helpers import random_scalars
+
+N = 16
+
+# Grand product z with z[0] = 1 and z[i+1] = z[i] * num_i / den_i, row by row
+def grand_product(domain, numerators, denominators):
+    state = numerators[0].one()
+    z = []
+    for num, den in zip(numerators, denominators):
+        z.append(state)
+        state = state.mul(num).mul(fr.Fr.inverse(den))
+    return from_coeff_vec(INTT(domain, z))
+
+def values(poly):
+    return [c.value for c in poly]
+
+def test_permutation_poly_matches_row_by_row_product():
+    rng = random.Random(1)
+    domain = Radix2EvaluationDomain.new(N, fr.Fr.zero())
+    wires = [random_scalars(rng, N) for _ in range(4)]
+    sigmas = [random_scalars(rng, N) for _ in range(4)]
+    beta, gamma = random_scalars(rng, 2)
+    ks = [beta.one(), constants.K1(), constants.K2(), constants.K3()]
+
+    numerators, denominators = [], []
+    for i, root in enumerate(domain.elements()):
+        num = den = beta.one()
+        for wire, sigma, k in zip(wires, sigmas, ks):
+            num = num.mul(mod.numerator_irreducible(root, wire[i], k, beta, gamma))
+            den = den.mul(mod.denominator_irreducible(wire[i], sigma[i], beta, gamma))
+        numerators.append(num)
+        denominators.append(den)
+
+    z_poly = mod.compute_permutation_poly(domain, wires, beta, gamma, None, sigmas)
+    assert values(z_poly) == values(grand_product(domain, numerators, denominators))
+
+def test_lookup_permutation_poly_matches_row_by_row_product():
+    rng = random.Random(2)
+    domain = Radix2EvaluationDomain.new(N, fr.Fr.zero())
+    f, t, h_1, h_2 = [random_scalars(rng, N) for _ in range(4)]
+    delta, epsilon = random_scalars(rng, 2)
+
+    numerators, denominators = [], []
+    for i in range(N):
+        j = (i + 1) % N
+        num, den = mod.lookup_ratio_terms(delta, epsilon, f[i], t[i], t[j], h_1[i], h_1[j], h_2[i])
+        numerators.append(num)
+        denominators.append(den)
+
+    p_poly = mod.compute_lookup_permutation_poly(domain, f, t, h_1, h_2, delta, epsilon)
+    assert values(p_poly) == values(grand_product(domain, numerators, denominators))
@@ -0,0 +1,52 @@
+import sys
+import struct
+from bls12_381 import fr
+from field_vector import FieldVector
+
+# Binary witness layout (all integers little-endian):
+#   header: magic "PLONKWIT", u32 version, u64 number of values
+#   data: every value in 32 bytes (canonical value)
+MAGIC = b"PLONKWIT"
+VERSION = 1
+HEADER = struct.Struct("<8sIQ")
+ELEM_BYTES = 32
+
+# Values read per chunk by `iter_witness_chunks`
+CHUNK = 1 << 14
+
+def is_binary_witness(filename):
+    with open(filename, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+def write_witness(values: FieldVector, filename):
+    values = FieldVector.from_list(values, fr.Fr)
+    with open(filename, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(values)))
+        f.write(b"".join(int(x).to_bytes(ELEM_BYTES, "little") for x in values.to_canonical()))
+
+# Stream the canonical values of a binary witness file in chunks
+def iter_witness_chunks(filename, chunk_size=CHUNK):
+    with open(filename, "rb") as f:
+        magic, version, count = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{filename} is not a binary witness file")
+        while count:
+            size = min(count, chunk_size)
+            data = f.read(size * ELEM_BYTES)
+            yield [int.from_bytes(data[pos:pos + ELEM_BYTES], "little") for pos in range(0, len(data), ELEM_BYTES)]
+            count -= size
+
+def read_witness(filename):
+    values = FieldVector([], fr.Fr)
+    for chunk in iter_witness_chunks(filename):
+        values.extend_raw(FieldVector.from_canonical(chunk, fr.Fr).values)
+    return values
+
+# Convert a text witness file (the `w_*_scalar.txt` format) to the binary format:
+#   python3 witness_file.py w_l_scalar.txt w_l_scalar.bin
+def convert_witness(text_file, binary_file):
+    from load import read_scalar_data
+    write_witness(read_scalar_data(text_file), binary_file)
+
+if __name__ == "__main__":
+    convert_witness(sys.argv[1], sys.argv[2])